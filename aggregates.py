@@ -0,0 +1,244 @@
+import numpy as np
+import pandas as pd
+
+# --- Per-Ward Aggregates ---
+class WardAggregates:
+    """Running per-ward row counts, sums and non-missing value counts.
+
+    Chunks are folded in with :meth:`update`; two aggregates built from different
+    parts of a file can be combined with :meth:`merge`. Memory depends on the
+    number of wards and columns, never on the number of rows.
+    """
+
+    def __init__(self, columns, sample_size=5000, seed=0):
+        self.columns = list(columns)
+        self.sample_size = sample_size
+        self.wards = []
+        self._ward_index = {}
+        n = len(self.columns)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.sums = np.zeros((0, n))
+        # Non-missing values per ward and column; means divide by these (pandas' skipna)
+        self.value_counts = np.zeros((0, n), dtype=np.int64)
+        # Rows with a blank Ward belong to no ward but still count towards the city total
+        self.unassigned_rows = 0
+        self.unassigned_sums = np.zeros(n)
+        self.unassigned_value_counts = np.zeros(n, dtype=np.int64)
+        # Bounded uniform row sample (reservoir) for the panels that plot raw rows
+        self.sample = None
+        self.rows_seen = 0
+        self._rng = np.random.default_rng(seed)
+
+    def _ward_rows(self, wards):
+        new = [w for w in wards if w not in self._ward_index]
+        if new:
+            n = len(self.columns)
+            for ward in new:
+                self._ward_index[ward] = len(self.wards)
+                self.wards.append(ward)
+            grow = len(new)
+            self.counts = np.concatenate([self.counts, np.zeros(grow, dtype=np.int64)])
+            self.sums = np.vstack([self.sums, np.zeros((grow, n))])
+            self.value_counts = np.vstack([self.value_counts, np.zeros((grow, n), dtype=np.int64)])
+        return np.array([self._ward_index[w] for w in wards], dtype=np.int64)
+
+    def update(self, chunk):
+        if chunk.empty:
+            # Still leaves an empty sample with the file's columns
+            if self.sample is None:
+                self.sample = chunk.iloc[:0].copy()
+            return self
+        blank = chunk['Ward'].isna()
+        if blank.any():
+            unassigned = chunk.loc[blank, self.columns]
+            self.unassigned_rows += len(unassigned)
+            self.unassigned_sums += unassigned.sum().to_numpy(dtype=float)
+            self.unassigned_value_counts += unassigned.count().to_numpy()
+        # groupby drops the blank wards handled above
+        grouped = chunk.groupby('Ward', sort=False)[self.columns]
+        sums, value_counts = grouped.sum(), grouped.count()
+        rows = self._ward_rows(list(sums.index))
+        self.counts[rows] += grouped.size().reindex(sums.index).to_numpy()
+        self.sums[rows] += sums.to_numpy(dtype=float)
+        self.value_counts[rows] += value_counts.to_numpy(dtype=np.int64)
+        self._update_sample(chunk)
+        return self
+
+    def _update_sample(self, chunk):
+        if self.sample is None:
+            self.sample = chunk.iloc[:0].copy()
+        # Vectorised Algorithm R: row i (0-based over the whole stream) replaces a
+        # random slot with probability sample_size / (i + 1)
+        positions = self.rows_seen + np.arange(len(chunk))
+        self.rows_seen += len(chunk)
+        free = max(self.sample_size - len(self.sample), 0)
+        if free:
+            self.sample = pd.concat([self.sample, chunk.iloc[:free]], ignore_index=True)
+        if len(chunk) > free:
+            slots = (self._rng.random(len(chunk) - free) * (positions[free:] + 1)).astype(np.int64)
+            chosen = np.flatnonzero(slots < self.sample_size)
+            if chosen.size:
+                # Later rows win when two of them draw the same slot
+                targets, last = np.unique(slots[chosen][::-1], return_index=True)
+                replacements = chunk.iloc[free + chosen[::-1][last]]
+                for column in self.sample.columns:
+                    values = self.sample[column].to_numpy(copy=True)
+                    values[targets] = replacements[column].to_numpy()
+                    self.sample[column] = values
+
+    def merge(self, other):
+        rows = self._ward_rows(other.wards)
+        self.counts[rows] += other.counts
+        self.sums[rows] += other.sums
+        self.value_counts[rows] += other.value_counts
+        self.unassigned_rows += other.unassigned_rows
+        self.unassigned_sums += other.unassigned_sums
+        self.unassigned_value_counts += other.unassigned_value_counts
+        if other.sample is not None:
+            combined = pd.concat([self.sample, other.sample], ignore_index=True) if self.sample is not None else other.sample
+            if len(combined) > self.sample_size:
+                combined = combined.sample(self.sample_size, random_state=0, ignore_index=True)
+            self.sample = combined
+        self.rows_seen += other.rows_seen
+        return self
+
+    # --- Read-side helpers used by the dashboard ---
+    @property
+    def total_rows(self):
+        return int(self.counts.sum()) + self.unassigned_rows
+
+
+# --- Ward Aggregate Cube ---
+TOTAL_KEY = 'All Wards'
+
+
+class WardCube:
+    """Per-ward sums, counts and means plus a city-wide total row, built once per dataset.
+
+    Both tables are indexed by a categorical Ward index whose last category is
+    ``TOTAL_KEY``, so every Key Metrics / ward detail lookup is a single hash
+    lookup instead of a scan. When built from a full frame, the cube also keeps the
+    row positions of each ward (grouped by ward code) so a ward's rows can be
+    taken without a boolean mask over the whole table; if the frame is already
+    clustered by ward, they are a plain slice, i.e. a view with no copy. A storage backend can
+    instead supply ``row_lookup(ward)`` to fetch them itself.
+
+    Sums skip missing values and means divide by ``value_counts``, the non-missing
+    values per ward and column (pandas' ``skipna``; defaults to ``counts``).
+    ``unassigned`` is ``(rows, sums, value_counts)`` for rows with no Ward: they
+    belong to no ward but still count towards the city-wide total.
+    """
+
+    def __init__(self, wards, columns, counts, sums, order=None, offsets=None, row_lookup=None,
+                 value_counts=None, unassigned=None):
+        self.wards = list(wards)
+        self._codes = {ward: code for code, ward in enumerate(self.wards)}
+        self.columns = list(columns)
+        index = pd.CategoricalIndex(self.wards + [TOTAL_KEY], categories=self.wards + [TOTAL_KEY], name='Ward')
+        shape = (len(self.wards), len(self.columns))
+        counts = np.asarray(counts, dtype=np.int64)
+        sums = np.asarray(sums, dtype=float).reshape(shape)
+        if value_counts is None:
+            value_counts = np.broadcast_to(counts[:, None], shape)
+        value_counts = np.asarray(value_counts, dtype=np.int64).reshape(shape)
+        total_rows, total_sums, total_values = counts.sum(), sums.sum(axis=0), value_counts.sum(axis=0)
+        if unassigned is not None:
+            rows, extra_sums, extra_values = unassigned
+            total_rows, total_sums, total_values = total_rows + rows, total_sums + extra_sums, total_values + extra_values
+        counts = np.append(counts, total_rows)
+        sums = np.vstack([sums, total_sums])
+        value_counts = np.vstack([value_counts, total_values])
+        self.counts = pd.Series(counts, index=index, name='Rows')
+        self.sums = pd.DataFrame(sums, index=index, columns=self.columns)
+        self.value_counts = pd.DataFrame(value_counts, index=index, columns=self.columns)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            # A ward with no values in a column has no mean (NaN), as in pandas
+            self.means = pd.DataFrame(np.where(value_counts > 0, sums / np.maximum(value_counts, 1), np.nan),
+                                      index=index, columns=self.columns)
+        self._order = order
+        self._offsets = offsets
+        self._row_lookup = row_lookup
+
+    @classmethod
+    def from_frame(cls, df):
+        # First-appearance order, matching data['Ward'].unique(); a blank Ward gets code -1
+        codes, wards = pd.factorize(df['Ward'], sort=False)
+        codes = codes.astype(np.int64)
+        n_wards = len(wards)
+        # Numbered wards are labels, not values
+        columns = df.select_dtypes(include=['number']).columns.drop('Ward', errors='ignore')
+        values = [df[c].to_numpy(dtype=float, na_value=np.nan) for c in columns]
+        assigned = codes >= 0
+        n_unassigned = len(codes) - int(assigned.sum())
+        ward_codes = codes[assigned] if n_unassigned else codes
+        ward_values = [v[assigned] for v in values] if n_unassigned else values
+        counts = np.bincount(ward_codes, minlength=n_wards)
+        sums = np.zeros((n_wards, len(columns)))
+        value_counts = np.zeros((n_wards, len(columns)), dtype=np.int64)
+        for i, v in enumerate(ward_values):
+            present = ~np.isnan(v)
+            sums[:, i] = np.bincount(ward_codes, weights=np.where(present, v, 0.0), minlength=n_wards)
+            value_counts[:, i] = np.bincount(ward_codes[present], minlength=n_wards)
+        unassigned = None
+        if n_unassigned:
+            missing = ~assigned
+            unassigned = (n_unassigned,
+                          np.array([np.nansum(v[missing]) for v in values]),
+                          np.array([np.count_nonzero(~np.isnan(v[missing])) for v in values], dtype=np.int64))
+        # Clustered frames (see data_loader) need no permutation at all; rows without
+        # a ward (code -1) sort first and are skipped by the offsets
+        order = None if np.all(codes[1:] >= codes[:-1]) else np.argsort(codes, kind='stable')
+        offsets = n_unassigned + np.concatenate([[0], np.cumsum(counts)])
+        return cls(wards, columns, counts, sums, order, offsets, value_counts=value_counts, unassigned=unassigned)
+
+    @classmethod
+    def from_aggregates(cls, aggregates):
+        return cls(aggregates.wards, aggregates.columns, aggregates.counts, aggregates.sums,
+                   value_counts=aggregates.value_counts,
+                   unassigned=(aggregates.unassigned_rows, aggregates.unassigned_sums,
+                               aggregates.unassigned_value_counts))
+
+    def total(self, column):
+        return self.sums.at[TOTAL_KEY, column]
+
+    def mean(self, column, ward=TOTAL_KEY):
+        return self.means.at[ward, column]
+
+    def ward_frame(self, stat="mean"):
+        table = self.means if stat == "mean" else self.sums
+        frame = table.drop(index=TOTAL_KEY).reset_index()
+        # Plain strings, so plotting libraries don't reserve a slot for the total row
+        frame['Ward'] = frame['Ward'].astype(str)
+        return frame
+
+    def ward_rows(self, df, ward):
+        if ward == TOTAL_KEY:
+            return df
+        if self._row_lookup is not None:
+            return self._row_lookup(ward)
+        if self._offsets is None:
+            return df[df['Ward'] == ward]
+        code = self._codes[ward]
+        start, stop = self._offsets[code], self._offsets[code + 1]
+        if self._order is None:
+            return df.iloc[start:stop]
+        return df.iloc[self._order[start:stop]]
+
+    def ward_detail(self, ward, prevalence_columns):
+        """Ward totals for the detail panel; prevalence is recomputed from summed cases."""
+        sums, means = self.sums.loc[ward], self.means.loc[ward]
+        detail = {
+            'Population': int(sums['Population']),
+            'Access_to_Sanitation_Pct': _tidy(round(means['Access_to_Sanitation_Pct'], 1)),
+            'Avg_Income_USD': _tidy(round(means['Avg_Income_USD'])),
+            'Num_Clinics': int(sums['Num_Clinics']),
+        }
+        for cases_col, prevalence_col in prevalence_columns:
+            detail[cases_col] = int(sums[cases_col])
+            detail[prevalence_col] = sums[cases_col] / sums['Population'] * 1000
+        return detail
+
+
+def _tidy(value):
+    # Show whole numbers without a trailing ".0"
+    return int(value) if float(value).is_integer() else value
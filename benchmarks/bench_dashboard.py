@@ -0,0 +1,245 @@
+"""Headless benchmark for app.py: rerun latency, peak memory and chart payload sizes.
+
+Each dataset size runs in its own subprocess (so peak RSS is per size) that drives
+the dashboard with Streamlit's AppTest. The columnar cache is deleted first, so
+``cold_load_s`` always includes parsing the CSV; a second subprocess then times
+``mapped_load_s``, a fresh server start that maps the columnar copy. Results are written as JSON; pass
+``--compare previous.json`` to fail on latency/memory regressions.
+
+    python benchmarks/bench_dashboard.py --sizes 10 10000 1000000 --out bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import data_loader  # noqa: E402
+
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+DATA_FILE = "urban_health_data.csv"
+DEFAULT_SIZES = [10, 10_000, 1_000_000, 10_000_000]
+GENERATE_CHUNK_ROWS = 1_000_000
+
+# Metrics compared by --compare; all are "lower is better"
+COMPARED_METRICS = ["cold_load_s", "mapped_load_s", "warm_rerun_s", "peak_rss_bytes"]
+
+
+# --- Synthetic Data ---
+def generate_csv(path, rows, wards, seed=0):
+    """Write a synthetic urban_health_data.csv with the dashboard's columns."""
+    rng = np.random.default_rng(seed)
+    ward_names = np.array([f"Ward {i:04d}" for i in range(wards)])
+    with open(path, "w", newline="") as f:
+        for start in range(0, rows, GENERATE_CHUNK_ROWS):
+            n = min(GENERATE_CHUNK_ROWS, rows - start)
+            population = rng.integers(1_000, 10_000, n)
+            chunk = pd.DataFrame({
+                'Ward': ward_names[rng.integers(0, wards, n)],
+                'Population': population,
+                'Avg_Age': rng.integers(20, 60, n),
+                'Diabetes_Cases': (population * rng.uniform(0.02, 0.08, n)).astype(int),
+                'Hypertension_Cases': (population * rng.uniform(0.04, 0.10, n)).astype(int),
+                'Flu_Cases': (population * rng.uniform(0.01, 0.05, n)).astype(int),
+                'Access_to_Sanitation_Pct': rng.integers(30, 100, n),
+                'Avg_Income_USD': rng.integers(500, 3_000, n),
+                'Num_Clinics': rng.integers(0, 6, n),
+            })
+            chunk.to_csv(f, index=False, header=start == 0)
+
+
+# --- Single-Size Run (subprocess) ---
+def _element_payloads(at):
+    import charts
+
+    payloads = {}
+    # st.line_chart is sent as a Vega-Lite element ("arrow_vega_lite_chart" in older Streamlit)
+    for name, elements in (("plotly_chart", at.get("plotly_chart")),
+                           ("vega_lite_chart", at.get("vega_lite_chart")),
+                           ("arrow_vega_lite_chart", at.get("arrow_vega_lite_chart")),
+                           ("dataframe", at.dataframe)):
+        for i, element in enumerate(elements):
+            payloads[f"{name}[{i}]"] = element.proto.ByteSize()
+    # Matplotlib panels are sent as PNGs; their bytes are the cached encodings
+    for key, image in list(charts.chart_cache._entries.items()):
+        payloads.setdefault(f"image:{key.kind}", len(image))
+    return payloads
+
+
+def _timed(action):
+    started = time.perf_counter()
+    at = action()
+    elapsed = time.perf_counter() - started
+    if at.exception:
+        raise RuntimeError(f"Dashboard raised: {[e.value for e in at.exception]}")
+    return elapsed
+
+
+def _widget(widgets, label_prefix):
+    return next(w for w in widgets if w.label.startswith(label_prefix))
+
+
+def _app_test(workdir, timeout):
+    # app.py resolves the CSV relative to the working directory
+    os.chdir(workdir)
+    from streamlit.testing.v1 import AppTest
+
+    return AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+
+def run_load(workdir, timeout):
+    at = _app_test(workdir, timeout)
+    return {"mapped_load_s": _timed(at.run)}
+
+
+def run_single(workdir, timeout):
+    at = _app_test(workdir, timeout)
+    result = {"cold_load_s": _timed(at.run)}
+    result["warm_rerun_s"] = _timed(at.run)
+
+    interactions = {}
+    # The line chart starts empty; plot the prevalence columns so its payload is measured
+    lines = _widget(at.multiselect, "Select indicators for Line Chart")
+    prevalence = [option for option in lines.options if "Prevalence" in option]
+    interactions["line_indicators"] = _timed(lines.set_value(prevalence).run)
+    result["payload_bytes"] = _element_payloads(at)
+    wards = _widget(at.sidebar.selectbox, "Select Ward")
+    interactions["ward_select"] = _timed(wards.select(wards.options[1]).run)
+    indicator = _widget(at.sidebar.selectbox, "Select Indicator")
+    interactions["indicator_select"] = _timed(indicator.select(indicator.options[1]).run)
+    hist = _widget(at.selectbox, "Select Indicator for Histogram")
+    interactions["histogram_indicator"] = _timed(hist.select(hist.options[-1]).run)
+    scatter_x = _widget(at.selectbox, "Select X-axis")
+    interactions["scatter_axes"] = _timed(scatter_x.select(scatter_x.options[0]).run)
+    # Last, since it translates every label used to find the widgets above
+    language = at.sidebar.selectbox[0]
+    interactions["language_switch"] = _timed(language.select("नेपाली").run)
+    result["interactions_s"] = interactions
+
+    result["peak_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    # Render workers (if enabled) are child processes with their own RSS, which is
+    # only accounted once they have exited
+    import render_workers
+    render_workers.shutdown()
+    result["peak_child_rss_bytes"] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+    return result
+
+
+# --- Driver ---
+def _run_subprocess(mode, workdir, timeout):
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), mode, workdir, "--timeout", str(timeout)],
+        capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1:]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def benchmark_size(rows, wards, data_dir, timeout):
+    workdir = os.path.join(data_dir, f"rows{rows}-wards{wards}")
+    os.makedirs(workdir, exist_ok=True)
+    csv_path = os.path.join(workdir, DATA_FILE)
+    if not os.path.exists(csv_path):
+        generate_csv(csv_path, rows, wards)
+    # The CSV is reused across runs, but its columnar copy must not be: a left-over
+    # .cache would turn the cold load into a memory-mapped one
+    shutil.rmtree(os.path.join(workdir, data_loader.CACHE_DIR_NAME), ignore_errors=True)
+    result = _run_subprocess("--single", workdir, timeout)
+    if "error" not in result:
+        result.update(_run_subprocess("--load-only", workdir, timeout))
+    result.update({"rows": rows, "wards": wards, "csv_bytes": os.path.getsize(csv_path)})
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, previous, tolerance):
+    """Return a list of regressions: metrics that got worse by more than ``tolerance``."""
+    previous_by_rows = {r["rows"]: r for r in previous["results"] if "error" not in r}
+    regressions = []
+    for result in current["results"]:
+        before = previous_by_rows.get(result["rows"])
+        if before is None or "error" in result:
+            continue
+        pairs = [(m, result[m], before[m]) for m in COMPARED_METRICS if m in before]
+        pairs += [(f"interactions_s.{k}", v, before.get("interactions_s", {}).get(k))
+                  for k, v in result["interactions_s"].items()]
+        for metric, now, then in pairs:
+            if then and now > then * (1 + tolerance):
+                regressions.append({"rows": result["rows"], "metric": metric, "before": then, "after": now})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="row counts to benchmark")
+    parser.add_argument("--wards", type=int, default=500, help="number of distinct wards")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "health-hub-bench"),
+                        help="where synthetic CSVs are generated (reused across runs)")
+    parser.add_argument("--timeout", type=float, default=1800, help="per-run AppTest timeout in seconds")
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    parser.add_argument("--compare", help="previous results JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown for --compare")
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    parser.add_argument("--load-only", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run_single(args.single, args.timeout)))
+        return 0
+    if args.load_only:
+        print(json.dumps(run_load(args.load_only, args.timeout)))
+        return 0
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "env": {k: v for k, v in os.environ.items() if k.startswith("HEALTH_HUB_")},
+        },
+        "results": [],
+    }
+    for rows in args.sizes:
+        print(f"Benchmarking {rows:,} rows...", file=sys.stderr)
+        report["results"].append(benchmark_size(rows, args.wards, args.data_dir, args.timeout))
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION rows={regression['rows']} {regression['metric']}: "
+                  f"{regression['before']:.3f} -> {regression['after']:.3f}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
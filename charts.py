@@ -0,0 +1,135 @@
+import io
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+from startup import lazy_module
+
+
+def _use_agg_backend():
+    # Figures are only ever encoded to bytes, never shown interactively
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+# Deferred until the first chart is drawn; importing these dominates cold start
+plt = lazy_module("matplotlib.pyplot", before_import=_use_agg_backend)
+sns = lazy_module("seaborn", before_import=_use_agg_backend)
+
+# Same encoding st.pyplot uses, so cached images look identical to the old output
+PNG_SAVEFIG_KWARGS = {"format": "png", "dpi": 200, "bbox_inches": "tight"}
+# Box outline / median colour, close to seaborn's default for filled boxes
+BOX_LINE_COLOR = "0.26"
+
+# --- Chart Cache ---
+# kind: "bar" / "box" / "hist" / "heatmap"; ward: the ward filter the chart was drawn for
+ChartKey = namedtuple("ChartKey", ["kind", "column", "ward", "language", "version"])
+
+
+class ChartCache:
+    """LRU cache of encoded chart images, bounded by entry count and total bytes."""
+
+    def __init__(self, max_bytes, max_entries=256):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            image = self._entries.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def peek(self, key):
+        """Return the cached image without counting a hit or miss or touching LRU order."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key, image):
+        if len(image) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size_bytes -= len(previous)
+            self._entries[key] = image
+            self.size_bytes += len(image)
+            while self.size_bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.size_bytes -= len(evicted)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# One cache per server process, shared by every session
+chart_cache = ChartCache(max_bytes=int(os.environ.get("HEALTH_HUB_CHART_CACHE_MB", 64)) * 1024 * 1024)
+
+
+# Figures drawn and encoded by this process
+figures_rendered = 0
+
+
+def render_png(draw, figsize=(10, 6)):
+    """Draw onto a fresh figure, encode it as PNG and release the figure."""
+    global figures_rendered
+    fig, ax = plt.subplots(figsize=figsize)
+    figures_rendered += 1
+    try:
+        draw(ax)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, **PNG_SAVEFIG_KWARGS)
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+# --- Chart Drawing ---
+def draw_bar(ax, ward_means, column, label, title):
+    sns.barplot(x='Ward', y=column, data=ward_means, ax=ax, palette="viridis", errorbar=None)
+    ax.tick_params(axis='x', labelrotation=45)
+    plt.setp(ax.get_xticklabels(), ha='right')
+    ax.set_ylabel(label)
+    ax.set_title(title)
+
+
+def draw_box(ax, box_stats, label, title):
+    # Drawn from precomputed per-ward summaries (distributions.ward_box_stats),
+    # styled like sns.boxplot(palette="Set2")
+    artists = ax.bxp(box_stats, positions=range(len(box_stats)), widths=0.8, patch_artist=True,
+                     boxprops={"edgecolor": BOX_LINE_COLOR}, medianprops={"color": BOX_LINE_COLOR},
+                     whiskerprops={"color": BOX_LINE_COLOR}, capprops={"color": BOX_LINE_COLOR},
+                     flierprops={"marker": "d", "markersize": 5, "markeredgecolor": BOX_LINE_COLOR})
+    for box, color in zip(artists["boxes"], sns.color_palette("Set2", len(box_stats), desat=0.75)):
+        box.set_facecolor(color)
+    ax.set_xlabel('Ward')
+    ax.tick_params(axis='x', labelrotation=45)
+    plt.setp(ax.get_xticklabels(), ha='right')
+    ax.set_ylabel(label)
+    ax.set_title(title)
+
+
+def draw_hist(ax, histogram, label, ylabel, title):
+    # Bars from precomputed bin counts (one weighted sample per bin) plus the
+    # precomputed KDE curve (distributions.histogram). Edges go in as a list:
+    # seaborn compares ``bins`` with "auto".
+    sns.histplot(x=histogram.edges[:-1], weights=histogram.counts, bins=histogram.edges.tolist(),
+                 ax=ax, color="skyblue", alpha=.5 if histogram.kde_x is not None else .75)
+    if histogram.kde_x is not None:
+        ax.plot(histogram.kde_x, histogram.kde_y, color="skyblue")
+    ax.set_xlabel(label)
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+
+
+def draw_heatmap(ax, correlation_matrix, title):
+    sns.heatmap(correlation_matrix, annot=True, cmap="coolwarm", fmt=".2f", linewidths=.5, ax=ax)
+    ax.set_title(title)
@@ -0,0 +1,251 @@
+import hashlib
+import io
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+
+
+# --- Streaming Co-moment State ---
+class StreamingCorrelation:
+    """Running per-pair means and co-moments that yield a correlation matrix.
+
+    Missing values are handled like ``DataFrame.corr()`` (pairwise deletion): each
+    pair of columns is accumulated over the rows where both are present, so
+    ``pair_count``, ``mean`` and ``m2`` are k x k. ``mean[i, j]`` and ``m2[i, j]``
+    are the mean and sum of squared deviations of column i over the rows shared
+    with column j. Batches are folded in with Chan et al.'s parallel update, per
+    pair, so two states built over different rows can be merged exactly.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.count = 0  # rows folded in, complete or not
+        self.pair_count = np.zeros((k, k))
+        self.mean = np.zeros((k, k))
+        self.m2 = np.zeros((k, k))
+        self.comoment = np.zeros((k, k))
+
+    def update(self, frame):
+        values = frame[self.columns].to_numpy(dtype=float)
+        if len(values) == 0:
+            return self
+        present = ~np.isnan(values)
+        weights = present.astype(float)
+        # Shift by the column means first so the sums below don't lose precision
+        column_count = weights.sum(axis=0)
+        shift = np.divide(np.where(present, values, 0.0).sum(axis=0), column_count,
+                          out=np.zeros(len(self.columns)), where=column_count > 0)
+        shifted = np.where(present, values - shift, 0.0)
+        pair_count = weights.T @ weights
+        pair_sums = shifted.T @ weights  # [i, j]: column i summed over rows with j present
+        inverse = np.divide(1.0, pair_count, out=np.zeros_like(pair_count), where=pair_count > 0)
+        batch = StreamingCorrelation(self.columns)
+        batch.count = len(values)
+        batch.pair_count = pair_count
+        batch.mean = shift[:, None] + pair_sums * inverse
+        batch.m2 = (shifted * shifted).T @ weights - pair_sums ** 2 * inverse
+        batch.comoment = shifted.T @ shifted - pair_sums * pair_sums.T * inverse
+        return self.merge(batch)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        total = self.pair_count + other.pair_count
+        zeros = np.zeros_like(total)
+        weight = np.divide(self.pair_count * other.pair_count, total, out=zeros.copy(), where=total > 0)
+        delta = other.mean - self.mean
+        self.comoment = self.comoment + other.comoment + delta * delta.T * weight
+        self.m2 = self.m2 + other.m2 + delta ** 2 * weight
+        self.mean = self.mean + delta * np.divide(other.pair_count, total, out=zeros, where=total > 0)
+        self.pair_count = total
+        self.count += other.count
+        return self
+
+    def corr(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            matrix = self.comoment / np.sqrt(self.m2 * self.m2.T)
+        return pd.DataFrame(np.clip(matrix, -1, 1), index=self.columns, columns=self.columns)
+
+
+# --- Append-Aware File Tracking ---
+class _BoundedReader(io.RawIOBase):
+    # Exposes only the next `remaining` bytes of a file to the CSV parser
+    def __init__(self, raw, remaining):
+        self._raw = raw
+        self._remaining = remaining
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        data = self._raw.read(size)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+
+class CorrelationTracker:
+    """Keeps a :class:`StreamingCorrelation` in sync with a CSV that grows by appends.
+
+    :meth:`refresh` costs one ``stat`` when the file is unchanged and only parses
+    the new rows when it has been appended to. Appends are recognised by the
+    sha256 of the already consumed bytes still matching; any other edit rebuilds
+    the state from scratch, streaming the file in chunks.
+
+    Once the whole file is consumed the state is saved next to the columnar copy,
+    keyed by that sha256 (the file's content hash), so after a restart the first
+    refresh loads it instead of parsing the CSV again.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.state = None
+        self.header = None
+        self.offset = 0  # bytes consumed, always just after a newline
+        self._stat = None
+        self._prefix_digest = None  # sha256 of the bytes in [0, offset)
+        self._matrix = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        with self._lock:
+            stat = os.stat(self.file_path)
+            stat_key = (stat.st_mtime_ns, stat.st_size)
+            if stat_key == self._stat:
+                return self._matrix
+            if self.state is None and self._restore(stat_key):
+                return self._matrix
+            with open(self.file_path, "rb") as f:
+                prefix = self._hash_range(hashlib.sha256(), f, 0, self.offset) if self.state is not None else None
+                if prefix is None or stat.st_size < self.offset or prefix.hexdigest() != self._prefix_digest:
+                    self._rebuild(f)
+                else:
+                    self._consume(f, prefix, header=False)
+            self._stat = stat_key
+            self._matrix = self.state.corr()
+            if self.offset == stat.st_size:
+                self._save()
+            return self._matrix
+
+    @staticmethod
+    def _hash_range(h, f, start, stop):
+        # Hashing is far cheaper than parsing, and only runs when the file changed
+        f.seek(start)
+        remaining = stop - start
+        while remaining > 0:
+            block = f.read(min(remaining, data_loader.HASH_BLOCK_SIZE))
+            if not block:
+                break
+            h.update(block)
+            remaining -= len(block)
+        return h
+
+    @staticmethod
+    def _complete_end(f):
+        # Position just after the last newline; a trailing partial line is left
+        # for the next refresh, once the writer has finished it.
+        size = f.seek(0, os.SEEK_END)
+        position = size
+        while position > 0:
+            step = min(position, 64 * 1024)
+            f.seek(position - step)
+            newline = f.read(step).rfind(b"\n")
+            if newline != -1:
+                return position - step + newline + 1
+            position -= step
+        return 0
+
+    def _rebuild(self, f):
+        self.state, self.header, self.offset = None, None, 0
+        self._prefix_digest = hashlib.sha256().hexdigest()
+        self._consume(f, hashlib.sha256(), header=True)
+
+    def _consume(self, f, prefix, header):
+        # prefix: sha256 of [0, offset), extended here with the newly consumed bytes
+        end = self._complete_end(f)
+        if end > self.offset:
+            self._prefix_digest = self._hash_range(prefix, f, self.offset, end).hexdigest()
+            f.seek(self.offset)
+            source = io.BufferedReader(_BoundedReader(f, end - self.offset))
+            options = {"header": 0} if header else {"header": None, "names": self.header}
+            with pd.read_csv(source, chunksize=data_loader.STREAM_CHUNK_ROWS, **options) as reader:
+                for chunk in reader:
+                    if self.header is None:
+                        self.header = list(chunk.columns)
+                    chunk = data_loader.add_prevalence_columns(chunk)
+                    if self.state is None:
+                        self.state = StreamingCorrelation(chunk.select_dtypes(include=['number']).columns)
+                    self.state.update(chunk)
+            self.offset = end
+        if self.state is None:
+            self.state = StreamingCorrelation([])
+
+    # --- Persistence ---
+    def _state_path(self, content_hash):
+        return os.path.splitext(data_loader.columnar_path(self.file_path, content_hash))[0] + ".corr.npz"
+
+    def _save(self):
+        if self.header is None or self._prefix_digest is None:
+            return
+        target_path = self._state_path(self._prefix_digest)
+        if os.path.exists(target_path):
+            return
+        state = self.state
+        try:
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            # Write to a temp file and rename so a concurrent reader never loads a partial file
+            tmp_path = f"{target_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(f, columns=np.array(state.columns, dtype=str), header=np.array(self.header, dtype=str),
+                         count=state.count, pair_count=state.pair_count, mean=state.mean, m2=state.m2,
+                         comoment=state.comoment, offset=self.offset)
+            os.replace(tmp_path, target_path)
+            data_loader.remove_stale_copies(target_path)
+        except OSError:
+            # Read-only checkout: the state just lives in memory
+            pass
+
+    def _restore(self, stat_key):
+        # The content hash is cached per (mtime, size) by data_loader, so this is
+        # free once the dashboard has fingerprinted the file
+        fingerprint = data_loader.source_fingerprint(self.file_path)
+        if fingerprint is None or fingerprint[:2] != stat_key:
+            return False
+        try:
+            with np.load(self._state_path(fingerprint[2])) as saved:
+                state = StreamingCorrelation(saved['columns'].tolist())
+                state.count = int(saved['count'])
+                state.pair_count, state.mean = saved['pair_count'], saved['mean']
+                state.m2, state.comoment = saved['m2'], saved['comoment']
+                header, offset = saved['header'].tolist(), int(saved['offset'])
+        except (OSError, KeyError, ValueError):
+            return False
+        if offset != stat_key[1]:
+            return False
+        self.state, self.header, self.offset = state, header, offset
+        self._prefix_digest = fingerprint[2]
+        self._stat = stat_key
+        self._matrix = state.corr()
+        return True
+
+
+_trackers = {}
+_trackers_lock = threading.Lock()
+
+
+def tracked_correlation(file_path):
+    """Correlation matrix of the CSV's numeric columns, kept incrementally per process."""
+    key = os.path.abspath(file_path)
+    with _trackers_lock:
+        tracker = _trackers.get(key)
+        if tracker is None:
+            tracker = _trackers[key] = CorrelationTracker(key)
+    return tracker.refresh()
@@ -0,0 +1,237 @@
+import hashlib
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from aggregates import WardAggregates
+
+# --- Derived Columns ---
+# (source count column, derived per-1000 column)
+PREVALENCE_COLUMNS = [
+    ("Diabetes_Cases", "Diabetes_Prevalence_per_1000"),
+    ("Hypertension_Cases", "Hypertension_Prevalence_per_1000"),
+    ("Flu_Cases", "Flu_Prevalence_per_1000"),
+]
+
+# Indicator display name (English; translated through `_`) -> column
+INDICATOR_OPTIONS = {
+    "Diabetes Prevalence": "Diabetes_Prevalence_per_1000",
+    "Hypertension Prevalence": "Hypertension_Prevalence_per_1000",
+    "Flu Prevalence": "Flu_Prevalence_per_1000",
+    "Access to Sanitation (%)": "Access_to_Sanitation_Pct",
+    "Average Income (USD)": "Avg_Income_USD",
+    "Number of Clinics": "Num_Clinics",
+    "Average Age": "Avg_Age",
+    "Population": "Population"
+}
+
+# Rows per chunk when streaming files that are too large to load whole
+STREAM_CHUNK_ROWS = 200_000
+
+# Columnar copies of the CSV live next to it, one file per content hash
+CACHE_DIR_NAME = ".cache"
+HASH_BLOCK_SIZE = 1 << 20
+
+# (path, mtime_ns, size) -> sha256 hex digest; survives Streamlit reruns because
+# this module is imported once per process, unlike app.py which is re-executed.
+_content_hashes = {}
+
+
+def add_prevalence_columns(df):
+    for cases_col, prevalence_col in PREVALENCE_COLUMNS:
+        df[prevalence_col] = (df[cases_col] / df['Population']) * 1000
+    return df
+
+
+# --- Fingerprinting ---
+def _hash_file(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_fingerprint(file_path):
+    """Return ``(mtime_ns, size, sha256)`` for the file, or None if it does not exist.
+
+    The content hash is only recomputed when the mtime or size changes, so calling
+    this on every rerun costs a single ``stat``.
+    """
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    stat_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+    content_hash = _content_hashes.get(stat_key)
+    if content_hash is None:
+        content_hash = _hash_file(file_path)
+        _content_hashes[stat_key] = content_hash
+    return stat.st_mtime_ns, stat.st_size, content_hash
+
+
+# --- Columnar Cache ---
+# Bumped whenever the layout of the columnar copy changes, so old copies are rebuilt
+COLUMNAR_FORMAT = 2
+
+
+# "<stem>-<first 16 hex digits of the content hash><suffix>"
+_CACHE_NAME = re.compile(r"(?P<stem>.*)-[0-9a-f]{16}(?P<suffix>\..*)")
+
+
+def columnar_path(file_path, content_hash):
+    directory, name = os.path.split(os.path.abspath(file_path))
+    stem = os.path.splitext(name)[0]
+    return os.path.join(directory, CACHE_DIR_NAME, f"{stem}-{content_hash[:16]}.v{COLUMNAR_FORMAT}.arrow")
+
+
+def _cluster_by_ward(df):
+    # Stable sort by ward in first-appearance order: each ward's rows become one
+    # contiguous range, so a ward filter is a slice (a view) rather than a copy.
+    # Rows with a blank Ward (code -1) go first, where WardCube expects them.
+    codes, _ = pd.factorize(df['Ward'], sort=False)
+    return df.iloc[np.argsort(codes, kind='stable')].reset_index(drop=True)
+
+
+def _write_columnar(df, target_path):
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False).combine_chunks()
+    # Write to a temp file and rename so a concurrent reader never maps a partial file
+    tmp_path = f"{target_path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, target_path)
+
+
+def remove_stale_copies(target_path):
+    # Drop copies (same suffix) written for earlier contents of the same CSV. Only
+    # "<stem>-<16 hex digits><suffix>" matches, so health.csv leaves the copies of
+    # health-2024.csv alone.
+    directory, name = os.path.split(target_path)
+    match = _CACHE_NAME.fullmatch(name)
+    if match is None:
+        return
+    stale = re.compile(re.escape(match['stem']) + r"-[0-9a-f]{16}" + re.escape(match['suffix']))
+    for entry in os.listdir(directory):
+        if stale.fullmatch(entry) and entry != name:
+            try:
+                os.remove(os.path.join(directory, entry))
+            except OSError:
+                pass
+
+
+def _map_columnar(target_path):
+    # Uncompressed Arrow IPC can be memory-mapped: the OS pages data in on demand
+    with pa.memory_map(target_path, "r") as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def read_columnar(target_path):
+    return _map_columnar(target_path).to_pandas(split_blocks=True)
+
+
+# --- Shared Dataset ---
+class SharedDataset:
+    """Read-only dataset loaded once per process and handed to every session.
+
+    ``frame`` is built over the memory-mapped Arrow buffers: numeric columns are
+    zero-copy, read-only NumPy views, and the mapped pages live in the OS page
+    cache, shared with the render workers and any other process mapping the file.
+    Callers must treat ``frame`` as immutable.
+    """
+
+    def __init__(self, table, source_path=None):
+        self.table = table
+        self.source_path = source_path
+        self.frame = table.to_pandas(split_blocks=True)
+
+    def _arrow_addresses(self):
+        return {buf.address for column in self.table.columns for chunk in column.chunks
+                for buf in chunk.buffers() if buf is not None}
+
+    def memory_report(self):
+        """Bytes held by the dataset, split into shared (mapped) and private copies."""
+        arrow_addresses = self._arrow_addresses()
+        private_bytes = 0
+        for column in self.frame.columns:
+            series = self.frame[column]
+            pa_array = getattr(series.array, "_pa_array", None)
+            if pa_array is not None:
+                addresses = {buf.address for chunk in pa_array.chunks for buf in chunk.buffers() if buf is not None}
+            else:
+                addresses = {series.to_numpy().__array_interface__['data'][0]}
+            if not addresses <= arrow_addresses:
+                private_bytes += int(series.memory_usage(index=False, deep=True))
+        report = {
+            "rows": self.table.num_rows,
+            "memory_mapped": self.source_path is not None,
+            "dataset_bytes": self.table.nbytes,
+            "private_copy_bytes": private_bytes,
+        }
+        report.update(process_memory())
+        return report
+
+
+def process_memory():
+    """Resident memory of this process in bytes (file-backed vs anonymous on Linux)."""
+    fields = {"VmRSS": "rss_bytes", "RssFile": "rss_file_bytes", "RssAnon": "rss_anon_bytes"}
+    report = {}
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                name, _, value = line.partition(":")
+                if name in fields:
+                    report[fields[name]] = int(value.split()[0]) * 1024
+    except OSError:
+        import resource
+        # Peak rather than current RSS, in KiB on Linux and bytes on macOS
+        report["max_rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return report
+
+
+def load_dataset(file_path, fingerprint=None):
+    """Load the CSV with prevalence columns as a :class:`SharedDataset`.
+
+    The first load for a given file content parses the CSV and writes the Arrow
+    copy; later loads (including after a restart) only map that file.
+    """
+    fingerprint = fingerprint or source_fingerprint(file_path)
+    if fingerprint is None:
+        raise FileNotFoundError(file_path)
+    target_path = columnar_path(file_path, fingerprint[2])
+    if not os.path.exists(target_path):
+        df = _cluster_by_ward(add_prevalence_columns(pd.read_csv(file_path)))
+        try:
+            _write_columnar(df, target_path)
+            remove_stale_copies(target_path)
+        except OSError:
+            # Read-only checkout: still serve the parsed data, just not memory-mapped
+            return SharedDataset(pa.Table.from_pandas(df, preserve_index=False))
+    return SharedDataset(_map_columnar(target_path), target_path)
+
+
+# --- Streaming Ingestion ---
+def iter_chunks(file_path, chunk_rows=STREAM_CHUNK_ROWS):
+    """Yield fixed-size DataFrame chunks of the CSV with prevalence columns added."""
+    with pd.read_csv(file_path, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            yield add_prevalence_columns(chunk)
+
+
+def stream_aggregates(file_path, chunk_rows=STREAM_CHUNK_ROWS):
+    """Fold the whole CSV into per-ward aggregates, one chunk in memory at a time."""
+    aggregates = None
+    for chunk in iter_chunks(file_path, chunk_rows):
+        if aggregates is None:
+            numeric_cols = chunk.select_dtypes(include=['number']).columns.drop('Ward', errors='ignore')
+            aggregates = WardAggregates(numeric_cols)
+        aggregates.update(chunk)
+    if aggregates is None:
+        # Header-only CSV: no chunks, so return empty aggregates (and an empty sample)
+        header = add_prevalence_columns(pd.read_csv(file_path, nrows=0))
+        aggregates = WardAggregates(header.select_dtypes(include=['number']).columns).update(header)
+    return aggregates
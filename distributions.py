@@ -0,0 +1,142 @@
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Points the KDE curve is evaluated at (seaborn's default gridsize)
+KDE_GRIDSIZE = 200
+# Grid the data is binned onto before the FFT convolution
+KDE_GRID_BINS = 2048
+# Matplotlib / seaborn whisker reach, in IQRs
+WHIS = 1.5
+# Outliers drawn per ward; beyond this an evenly spaced subset (extremes included) is kept
+MAX_FLIERS = 500
+MAX_SUMMARIES = 64
+
+# counts / edges: the histogram bars; kde_x / kde_y: the KDE curve scaled to the
+# bars' area (both None when the data has no spread)
+Histogram = namedtuple("Histogram", ["counts", "edges", "kde_x", "kde_y"])
+
+
+# --- Histogram and KDE ---
+def binned_kde(values, lo, hi, gridsize=KDE_GRIDSIZE, grid_bins=KDE_GRID_BINS):
+    """Gaussian KDE (Scott's bandwidth) of ``values`` on ``gridsize`` points over [lo, hi].
+
+    The data is linearly binned onto ``grid_bins`` points and convolved with the
+    kernel by FFT, so the cost is O(n + grid_bins log grid_bins) rather than
+    O(n * gridsize). Returns ``(None, None)`` when the bandwidth would be zero.
+    """
+    n = values.size
+    bw = values.std(ddof=1) * n ** (-1 / 5) if n > 1 else 0.0
+    if not bw > 0 or not hi > lo:
+        return None, None
+    delta = (hi - lo) / (grid_bins - 1)
+    # Linear binning: each point's weight is split between its two nearest grid points
+    pos = (values - lo) / delta
+    left = np.clip(np.floor(pos).astype(np.int64), 0, grid_bins - 2)
+    frac = pos - left
+    weights = np.bincount(left, 1 - frac, grid_bins) + np.bincount(left + 1, frac, grid_bins)
+    # Kernel sampled on the grid out to 4 bandwidths, normalised to unit mass
+    reach = min(grid_bins - 1, int(np.ceil(4 * bw / delta)))
+    kernel = np.exp(-0.5 * (np.arange(-reach, reach + 1) * delta / bw) ** 2)
+    kernel /= kernel.sum() * delta
+    size = 1 << int(np.ceil(np.log2(grid_bins + 2 * reach)))
+    density = np.fft.irfft(np.fft.rfft(weights, size) * np.fft.rfft(kernel, size), size)
+    density = np.maximum(density[reach:reach + grid_bins], 0) / n
+    support = np.linspace(lo, hi, gridsize)
+    return support, np.interp(support, np.linspace(lo, hi, grid_bins), density)
+
+
+def histogram(values):
+    """Histogram with numpy's "auto" bins (as sns.histplot) and its KDE curve."""
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return Histogram(np.zeros(0), np.zeros(1), None, None)
+    edges = np.histogram_bin_edges(values, bins="auto")
+    counts, _ = np.histogram(values, edges)
+    kde_x, kde_y = binned_kde(values, edges[0], edges[-1])
+    if kde_y is not None:
+        # Same scaling seaborn applies: the curve encloses the histogram's area
+        kde_y = kde_y * (counts * np.diff(edges)).sum()
+    return Histogram(counts, edges, kde_x, kde_y)
+
+
+# --- Box Plot Statistics ---
+def _group_quantile(values, starts, counts, q):
+    # Linear interpolation between order statistics, as np.percentile does
+    pos = starts + q * np.maximum(counts - 1, 0)
+    lower = np.floor(pos).astype(np.int64)
+    upper = np.minimum(lower + 1, starts + np.maximum(counts - 1, 0))
+    return values[lower] + (values[upper] - values[lower]) * (pos - lower)
+
+
+def ward_box_stats(wards, values, whis=WHIS):
+    """Per-ward five-number summaries and outliers, ready for ``ax.bxp``.
+
+    Wards keep their order of first appearance (as sns.boxplot). One sort of the
+    whole column replaces a quartile computation per ward per rerun.
+    """
+    codes, labels = pd.factorize(np.asarray(wards), sort=False)
+    values = np.asarray(values, dtype=float)
+    keep = (codes >= 0) & np.isfinite(values)
+    codes, values = codes[keep], values[keep]
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+    counts = np.bincount(codes, minlength=len(labels))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+    q1, med, q3 = (np.full(len(labels), np.nan) for _ in range(3))
+    for out, q in ((q1, 0.25), (med, 0.5), (q3, 0.75)):
+        out[present] = _group_quantile(values, starts[present], counts[present], q)
+    iqr = q3 - q1
+
+    stats = []
+    for i in np.flatnonzero(present):
+        group = values[starts[i]:starts[i] + counts[i]]
+        # Whiskers reach the most extreme values within whis * IQR of the box
+        lo = np.searchsorted(group, q1[i] - whis * iqr[i], "left")
+        hi = np.searchsorted(group, q3[i] + whis * iqr[i], "right")
+        whislo = min(group[lo], q1[i]) if lo < group.size else q1[i]
+        whishi = max(group[hi - 1], q3[i]) if hi > 0 else q3[i]
+        fliers = np.concatenate((group[:np.searchsorted(group, whislo, "left")],
+                                 group[np.searchsorted(group, whishi, "right"):]))
+        if fliers.size > MAX_FLIERS:
+            fliers = fliers[np.linspace(0, fliers.size - 1, MAX_FLIERS).round().astype(np.int64)]
+        stats.append({"label": str(labels[i]), "q1": q1[i], "med": med[i], "q3": q3[i],
+                      "whislo": whislo, "whishi": whishi, "fliers": fliers})
+    return stats
+
+
+# --- Summary Cache ---
+# (dataset version, summary kind, column, row count) -> summary; shared by every session
+_summaries = OrderedDict()
+_lock = threading.Lock()
+
+
+def _cached(key, compute):
+    if key[0] is None:
+        return compute()
+    with _lock:
+        summary = _summaries.get(key)
+        if summary is not None:
+            _summaries.move_to_end(key)
+            return summary
+    summary = compute()
+    with _lock:
+        _summaries[key] = summary
+        while len(_summaries) > MAX_SUMMARIES:
+            _summaries.popitem(last=False)
+    return summary
+
+
+def column_histogram(data, column, version):
+    """Histogram and KDE of ``data[column]``, computed once per dataset version."""
+    return _cached((version, "hist", column, len(data)), lambda: histogram(data[column].to_numpy()))
+
+
+def column_box_stats(data, column, version):
+    """Per-ward box statistics of ``data[column]``, computed once per dataset version."""
+    return _cached((version, "box", column, len(data)),
+                   lambda: ward_box_stats(data['Ward'].to_numpy(), data[column].to_numpy()))
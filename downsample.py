@@ -0,0 +1,61 @@
+import numpy as np
+
+# Above these sizes the scatter / line charts default to an aggregated view
+SCATTER_POINT_THRESHOLD = 5000
+LINE_POINT_THRESHOLD = 2000
+DENSITY_BINS = 60
+
+
+def density_grid(x, y, bins=DENSITY_BINS):
+    """Bin points into a ``bins`` x ``bins`` count grid.
+
+    Returns ``(x_centers, y_centers, counts)`` with ``counts[i, j]`` the number of
+    points in row ``i`` (y) and column ``j`` (x), ready to be drawn as a heatmap.
+    The payload is bins**2 numbers however many points there are.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    finite = np.isfinite(x) & np.isfinite(y)
+    counts, x_edges, y_edges = np.histogram2d(x[finite], y[finite], bins=bins)
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+    return x_centers, y_centers, counts.T
+
+
+def lttb_indices(y, n_out):
+    """Largest-Triangle-Three-Buckets: pick ``n_out`` indices that keep the series' shape.
+
+    Points are treated as evenly spaced along x (row order). The first and last
+    points are always kept.
+    """
+    y = np.asarray(y, dtype=float)
+    n = y.size
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=float)
+    # Bucket b covers [edges[b], edges[b + 1]); first and last points sit outside
+    edges = np.floor(np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # The third triangle vertex is the average of the next bucket (or the last point)
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = np.nanmean(y[end:next_end])
+        area = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + (int(np.nanargmax(area)) if np.isfinite(area).any() else 0)
+        selected[bucket + 1] = previous
+    return selected
+
+
+def downsample_rows(frame, columns, n_out=LINE_POINT_THRESHOLD):
+    """Keep the rows LTTB selects for any of ``columns``, in their original order."""
+    if len(frame) <= n_out:
+        return frame
+    per_column = max(n_out // max(len(columns), 1), 3)
+    keep = np.unique(np.concatenate([lttb_indices(frame[c].to_numpy(), per_column) for c in columns]))
+    return frame.iloc[keep]
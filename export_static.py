@@ -0,0 +1,425 @@
+"""Pre-render every dashboard view into a static bundle for a plain file server.
+
+Walks language x ward (including All Wards) x indicator and writes one HTML page
+per combination. Matplotlib charts are shared PNGs and plotly charts shared JSON
+specs, since most charts do not depend on the ward. manifest.json records a
+digest of the data and labels behind every file, so re-running after the CSV
+changes only re-renders the charts whose inputs changed and only rewrites the
+pages whose HTML changed.
+
+    python export_static.py --out static_site
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import as_completed
+
+import numpy as np
+import pandas as pd
+
+import charts
+import correlation
+import data_loader
+import downsample
+import render_workers
+from aggregates import TOTAL_KEY, WardCube
+from charts import ChartKey
+from render_workers import RenderJob, draw_job
+from startup import lazy_module
+from translations import translations
+
+px = lazy_module("plotly.express")
+
+DATA_FILE = "urban_health_data.csv"
+DEFAULT_OUT = "static_site"
+MANIFEST_FILE = "manifest.json"
+# Bump when the page or chart layout changes, so the next export rebuilds everything
+EXPORT_FORMAT = 1
+# language -> directory name
+LANGUAGE_CODES = {"English": "en", "नेपाली": "ne"}
+# The dashboard's default scatter axes and line chart indicators
+SCATTER_AXES = ("Avg_Income_USD", "Diabetes_Prevalence_per_1000")
+LINE_COLUMNS = ["Diabetes_Prevalence_per_1000", "Hypertension_Prevalence_per_1000"]
+
+PAGE_STYLE = """
+body { font-family: sans-serif; margin: 0 auto; max-width: 1400px; padding: 1rem 2rem; color: #262730; }
+nav { display: flex; gap: 1.5rem; margin-bottom: 1rem; }
+.metrics { display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem; }
+.metric .label { font-size: 0.9rem; }
+.metric .value { font-size: 1.8rem; }
+.row { display: grid; grid-template-columns: 1fr 1fr; gap: 2rem; }
+img { max-width: 100%; }
+.plotly { min-height: 450px; }
+table { border-collapse: collapse; }
+td, th { border: 1px solid #ddd; padding: 0.25rem 0.5rem; }
+"""
+
+PLOTLY_LOADER = """
+document.querySelectorAll(".plotly").forEach(function (el) {
+  fetch(el.dataset.spec).then(function (r) { return r.json(); }).then(function (spec) {
+    Plotly.newPlot(el, spec.data, spec.layout, {responsive: true});
+  });
+});
+"""
+
+
+# --- Helpers ---
+def translator(language):
+    """The dashboard's `_` helper, for a fixed language."""
+    def _(key, **kwargs):
+        return translations[language].get(key, key).format(**kwargs)
+    return _
+
+
+def slug(name):
+    text = re.sub(r"[^0-9A-Za-z]+", "-", str(name)).strip("-").lower()
+    # Names without Latin letters or digits still get a stable file name
+    return text or hashlib.sha256(str(name).encode()).hexdigest()[:12]
+
+
+def unique_slugs(names):
+    slugs, taken = {}, set()
+    for name in names:
+        candidate = slug(name)
+        if candidate in taken:
+            candidate = f"{candidate}-{hashlib.sha256(str(name).encode()).hexdigest()[:8]}"
+        slugs[name] = candidate
+        taken.add(candidate)
+    return slugs
+
+
+def digest(*parts):
+    """Content digest of the inputs a file is built from."""
+    h = hashlib.sha256(f"format={EXPORT_FORMAT}".encode())
+    for part in parts:
+        if isinstance(part, (pd.Series, pd.DataFrame)):
+            part = pd.util.hash_pandas_object(part, index=False).to_numpy()
+        h.update(part.tobytes() if isinstance(part, np.ndarray) else repr(part).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def write_atomic(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def write_if_changed(path, content):
+    """Write ``content`` unless the file already holds it; keeps mtimes (and ETags) stable."""
+    try:
+        with open(path, "rb") as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    write_atomic(path, content)
+    return True
+
+
+# --- Charts ---
+def chart_jobs(language, data, cube, version, column_digests, correlation_matrix):
+    """{asset path: (input digest, RenderJob)} for every matplotlib chart in one language."""
+    _ = translator(language)
+    code = LANGUAGE_CODES[language]
+    ward_means = cube.ward_frame("mean")
+    jobs = {}
+    for indicator_key, column in data_loader.INDICATOR_OPTIONS.items():
+        display = _(indicator_key)
+        labels = (display, _('bar_chart_title', indicator=display))
+        jobs[f"assets/{code}/bar-{slug(column)}.png"] = (
+            digest("bar", ward_means[['Ward', column]], labels),
+            RenderJob(ChartKey("bar", column, TOTAL_KEY, language, version), labels))
+        labels = (display, _('distribution_by_ward_box', indicator=display))
+        jobs[f"assets/{code}/box-{slug(column)}.png"] = (
+            digest("box", column_digests['Ward'], column_digests[column], labels),
+            RenderJob(ChartKey("box", column, TOTAL_KEY, language, version), labels))
+        labels = (display, _("Frequency"), _('hist_plot_title', indicator=display))
+        jobs[f"assets/{code}/hist-{slug(column)}.png"] = (
+            digest("hist", column_digests[column], labels),
+            RenderJob(ChartKey("hist", column, TOTAL_KEY, language, version), labels))
+    labels = (_("correlation_matrix_title"),)
+    jobs[f"assets/{code}/heatmap.png"] = (
+        digest("heatmap", correlation_matrix.to_numpy(), list(correlation_matrix.columns), labels),
+        RenderJob(ChartKey("heatmap", None, TOTAL_KEY, language, version), labels, correlation_matrix))
+    return jobs
+
+
+def render_images(jobs, data, cube, columnar_file, workers):
+    """Yield ``(asset path, png bytes)`` for each RenderJob, on a process pool when possible."""
+    if workers > 0 and columnar_file and jobs:
+        with render_workers.make_pool(columnar_file, workers) as pool:
+            futures = {render_workers.submit_job(pool, job): path for path, job in jobs.items()}
+            for future in as_completed(futures):
+                image, _ = future.result()
+                yield futures[future], image
+        return
+    for path, job in jobs.items():
+        yield path, charts.render_png(draw_job(job, data, cube), render_workers.FIGSIZES.get(job.key.kind, (10, 6)))
+
+
+def plotly_specs(language, data, cube, column_digests):
+    """{asset path: (input digest, figure builder)} for every plotly chart in one language."""
+    _ = translator(language)
+    code = LANGUAGE_CODES[language]
+    specs = {}
+
+    ward_sums = cube.ward_frame("sum")
+    title = _('population_distribution_pie')
+
+    def pie():
+        fig = px.pie(ward_sums, values='Population', names='Ward', title=title,
+                     color_discrete_sequence=px.colors.qualitative.Pastel)
+        fig.update_traces(textposition='inside', textinfo='percent+label')
+        return fig
+    specs[f"assets/{code}/pie.json"] = (digest("pie", ward_sums[['Ward', 'Population']], title), pie)
+
+    x_col, y_col = SCATTER_AXES
+    x_label, y_label = _(x_col.replace('_', ' ').title()), _(y_col.replace('_', ' ').title())
+    scatter_title = _('scatter_plot_title', y_axis=y_label, x_axis=x_label)
+    # Same default as the dashboard: every point for small data, a density grid above the threshold
+    exact = len(data) <= downsample.SCATTER_POINT_THRESHOLD
+
+    def scatter():
+        if exact:
+            return px.scatter(data, x=x_col, y=y_col, color='Ward', title=scatter_title,
+                              labels={x_col: x_label, y_col: y_label}, hover_data=['Population'])
+        x_centers, y_centers, counts = downsample.density_grid(data[x_col], data[y_col])
+        return px.imshow(counts, x=x_centers, y=y_centers, origin='lower', aspect='auto',
+                         color_continuous_scale="Viridis", title=scatter_title,
+                         labels={'x': x_label, 'y': y_label, 'color': _("Frequency")})
+    specs[f"assets/{code}/scatter.json"] = (
+        digest("scatter", exact, column_digests['Ward'], column_digests[x_col], column_digests[y_col],
+               scatter_title, _("Frequency")),
+        scatter)
+
+    def line():
+        rows = downsample.downsample_rows(data, LINE_COLUMNS)
+        return px.line(rows, x='Ward', y=LINE_COLUMNS, title=_('indicator_comparison_line'))
+    specs[f"assets/{code}/line.json"] = (
+        digest("line", column_digests['Ward'], *(column_digests[c] for c in LINE_COLUMNS),
+               _('indicator_comparison_line')),
+        line)
+    return specs
+
+
+# --- Pages ---
+def _metric(label, value):
+    return (f'<div class="metric"><div class="label">{html.escape(str(label))}</div>'
+            f'<div class="value">{html.escape(str(value))}</div></div>')
+
+
+def _page(language, title, body, root):
+    return f"""<!DOCTYPE html>
+<html lang="{LANGUAGE_CODES[language]}">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+<style>{PAGE_STYLE}</style>
+<script src="{root}assets/plotly.min.js"></script>
+</head>
+<body>
+{body}
+<script>{PLOTLY_LOADER}</script>
+</body>
+</html>
+""".encode()
+
+
+def view_page(language, ward, ward_slug, indicator_key, cube, page_path):
+    """HTML for one (language, ward, indicator) view: the dashboard's main area."""
+    _ = translator(language)
+    code = LANGUAGE_CODES[language]
+    column = data_loader.INDICATOR_OPTIONS[indicator_key]
+    root = "../../"
+    asset = f"{root}assets/{code}/"
+    ward_display = _("all_wards") if ward == TOTAL_KEY else ward
+    display = _(indicator_key)
+
+    other_language = next(lang for lang in LANGUAGE_CODES if lang != language)
+    parts = [
+        f'<nav><a href="../index.html">{html.escape(_("hub_title"))}</a>'
+        f'<a href="{root}{LANGUAGE_CODES[other_language]}/{page_path}">{html.escape(other_language)}</a></nav>',
+        f"<h1>{html.escape(_('dashboard_title'))}</h1>",
+        f"<p>{html.escape(_('dashboard_subtitle'))}</p>",
+        f"<p>{html.escape(_('select_ward'))} <b>{html.escape(ward_display)}</b> &middot; "
+        f"{html.escape(_('select_indicator_bar_box'))} <b>{html.escape(display)}</b></p>",
+        f"<h2>{html.escape(_('key_metrics_header'))}</h2>",
+        '<div class="metrics">'
+        + _metric(_("total_population"), f"{int(cube.total('Population')):,}")
+        + _metric(_("avg_diabetes_prev"), f"{cube.mean('Diabetes_Prevalence_per_1000'):.2f} per 1000")
+        + _metric(_("avg_hypertension_prev"), f"{cube.mean('Hypertension_Prevalence_per_1000'):.2f} per 1000")
+        + _metric(_("total_clinics"), int(cube.total('Num_Clinics')))
+        + "</div><hr>",
+        f"<h2>{html.escape(_('Visualizations'))}</h2>",
+        f"<h3>{html.escape(_('ward_comparisons'))}</h3>",
+        f'<div class="row"><div><img src="{asset}bar-{slug(column)}.png" '
+        f'alt="{html.escape(_("bar_chart_title", indicator=display))}"></div>'
+        f'<div class="plotly" data-spec="{asset}pie.json"></div></div><hr>',
+        f"<h3>{html.escape(_('relationships_trends'))}</h3>",
+        f'<div class="row"><div class="plotly" data-spec="{asset}scatter.json"></div>'
+        f'<div class="plotly" data-spec="{asset}line.json"></div></div><hr>',
+        f"<h3>{html.escape(_('distribution_analysis'))}</h3>",
+        f'<div class="row"><div><img src="{asset}box-{slug(column)}.png" '
+        f'alt="{html.escape(_("distribution_by_ward_box", indicator=display))}"></div>'
+        f'<div><img src="{asset}hist-{slug(column)}.png" '
+        f'alt="{html.escape(_("hist_plot_title", indicator=display))}"></div></div><hr>',
+        f"<h3>{html.escape(_('correlation_analysis'))}</h3>",
+        f'<img src="{asset}heatmap.png" alt="{html.escape(_("correlation_matrix_title"))}">',
+    ]
+    if ward != TOTAL_KEY:
+        detail = cube.ward_detail(ward, data_loader.PREVALENCE_COLUMNS)
+        parts += [
+            f"<h3>{html.escape(_('detailed_metrics_for_ward', ward=ward))}</h3>",
+            '<div class="metrics">'
+            + _metric(_("Population"), f"{detail['Population']:,}")
+            + _metric(_("diabetes_cases_metric"), f"{detail['Diabetes_Cases']} ({detail['Diabetes_Prevalence_per_1000']:.2f} per 1000)")
+            + _metric(_("hypertension_cases_metric"), f"{detail['Hypertension_Cases']} ({detail['Hypertension_Prevalence_per_1000']:.2f} per 1000)")
+            + _metric(_("flu_cases_metric"), f"{detail['Flu_Cases']} ({detail['Flu_Prevalence_per_1000']:.2f} per 1000)")
+            + _metric(_("access_to_sanitation_metric"), f"{detail['Access_to_Sanitation_Pct']}%")
+            + _metric(_("average_income_metric"), f"${detail['Avg_Income_USD']:,}")
+            + _metric(_("num_clinics_metric"), detail['Num_Clinics'])
+            + "</div>",
+        ]
+    parts.append(f"<hr><p>{html.escape(_('sidebar_info'))}</p>")
+    return _page(language, f"{_('hub_title')} - {ward_display} - {display}", "\n".join(parts), root)
+
+
+def index_page(language, ward_slugs):
+    """Per-language table of links: one row per ward, one column per indicator."""
+    _ = translator(language)
+    header = "".join(f"<th>{html.escape(_(key))}</th>" for key in data_loader.INDICATOR_OPTIONS)
+    rows = []
+    for ward, ward_slug in ward_slugs.items():
+        ward_display = _("all_wards") if ward == TOTAL_KEY else ward
+        cells = "".join(f'<td><a href="{ward_slug}/{slug(key)}.html">{html.escape(_(key))}</a></td>'
+                        for key in data_loader.INDICATOR_OPTIONS)
+        rows.append(f"<tr><th>{html.escape(ward_display)}</th>{cells}</tr>")
+    body = (f"<h1>{html.escape(_('hub_title'))}</h1>"
+            f"<table><tr><th>{html.escape(_('select_ward'))}</th>{header}</tr>{''.join(rows)}</table>")
+    return _page(language, _("hub_title"), body, "../")
+
+
+def root_page():
+    links = "".join(f'<li><a href="{code}/index.html">{html.escape(language)}</a></li>'
+                    for language, code in LANGUAGE_CODES.items())
+    return _page("English", "Urban Health Data Hub", f"<ul>{links}</ul>", "")
+
+
+# --- Export ---
+def _read_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return manifest.get("files", {}) if manifest.get("format") == EXPORT_FORMAT else {}
+
+
+def export(csv_path, out_dir, workers, force=False):
+    """Bring the bundle in ``out_dir`` up to date with ``csv_path``; return a summary dict."""
+    fingerprint = data_loader.source_fingerprint(csv_path)
+    if fingerprint is None:
+        raise FileNotFoundError(csv_path)
+    dataset = data_loader.load_dataset(csv_path, fingerprint)
+    data = dataset.frame
+    cube = WardCube.from_frame(data)
+    version = fingerprint[2]
+
+    previous = {} if force else _read_manifest(out_dir)
+    files = {}
+    summary = {"assets_rendered": 0, "assets_total": 0, "pages_written": 0, "pages_total": 0, "removed": 0}
+
+    def is_current(path, input_digest):
+        files[path] = input_digest
+        summary["assets_total"] += 1
+        return previous.get(path) == input_digest and os.path.exists(os.path.join(out_dir, path))
+
+    # plotly.js ships with the bundle so it needs nothing but a file server
+    import plotly
+    if not is_current("assets/plotly.min.js", digest("plotly.js", plotly.__version__)):
+        from plotly.offline import get_plotlyjs
+        write_atomic(os.path.join(out_dir, "assets/plotly.min.js"), get_plotlyjs().encode())
+        summary["assets_rendered"] += 1
+
+    # Hashed once and shared by the digests of every chart drawn from these columns
+    columns = {'Ward', *data_loader.INDICATOR_OPTIONS.values(), *SCATTER_AXES, *LINE_COLUMNS}
+    column_digests = {column: digest(data[column]) for column in columns}
+    correlation_matrix = correlation.tracked_correlation(csv_path)
+
+    stale_jobs = {}
+    for language in LANGUAGE_CODES:
+        for path, (input_digest, job) in chart_jobs(language, data, cube, version, column_digests,
+                                                    correlation_matrix).items():
+            if not is_current(path, input_digest):
+                stale_jobs[path] = job
+        for path, (input_digest, build) in plotly_specs(language, data, cube, column_digests).items():
+            if not is_current(path, input_digest):
+                write_atomic(os.path.join(out_dir, path), build().to_json().encode())
+                summary["assets_rendered"] += 1
+    for path, image in render_images(stale_jobs, data, cube, dataset.source_path, workers):
+        write_atomic(os.path.join(out_dir, path), image)
+        summary["assets_rendered"] += 1
+
+    # Pages are cheap to build; only the ones whose HTML changed are rewritten
+    ward_slugs = unique_slugs([TOTAL_KEY] + cube.wards)
+    pages = {"index.html": root_page()}
+    for language, code in LANGUAGE_CODES.items():
+        pages[f"{code}/index.html"] = index_page(language, ward_slugs)
+        for ward, ward_slug in ward_slugs.items():
+            for indicator_key in data_loader.INDICATOR_OPTIONS:
+                page_path = f"{ward_slug}/{slug(indicator_key)}.html"
+                pages[f"{code}/{page_path}"] = view_page(language, ward, ward_slug, indicator_key, cube, page_path)
+    for path, content in pages.items():
+        files[path] = hashlib.sha256(content).hexdigest()
+        summary["pages_total"] += 1
+        if write_if_changed(os.path.join(out_dir, path), content):
+            summary["pages_written"] += 1
+
+    # Views that no longer exist (e.g. a ward removed from the CSV)
+    for path in set(previous) - set(files):
+        try:
+            os.remove(os.path.join(out_dir, path))
+            summary["removed"] += 1
+        except FileNotFoundError:
+            pass
+    for directory, _, _ in sorted(os.walk(out_dir), reverse=True):
+        if directory != out_dir and not os.listdir(directory):
+            os.rmdir(directory)
+
+    write_atomic(os.path.join(out_dir, MANIFEST_FILE),
+                 json.dumps({"format": EXPORT_FORMAT, "dataset_version": version, "files": files},
+                            indent=1, sort_keys=True).encode())
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", default=DATA_FILE, help="source CSV (default: %(default)s)")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="bundle directory (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="render processes; 0 renders in this process (default: %(default)s)")
+    parser.add_argument("--force", action="store_true", help="ignore the manifest and rebuild everything")
+    parser.add_argument("--clean", action="store_true", help="delete the bundle directory first")
+    args = parser.parse_args()
+
+    if args.clean and os.path.isdir(args.out):
+        shutil.rmtree(args.out)
+    started = time.perf_counter()
+    summary = export(args.csv, args.out, args.workers, args.force)
+    print(f"Rendered {summary['assets_rendered']} of {summary['assets_total']} assets, "
+          f"wrote {summary['pages_written']} of {summary['pages_total']} pages, "
+          f"removed {summary['removed']} stale files in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
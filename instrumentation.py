@@ -0,0 +1,196 @@
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import charts
+import data_loader
+import startup
+
+# Write the Prometheus text to this file after every script run (unset: don't)
+METRICS_FILE = os.environ.get("HEALTH_HUB_METRICS_FILE")
+# Serve the Prometheus text on http://127.0.0.1:<port>/metrics (unset: don't)
+METRICS_PORT = os.environ.get("HEALTH_HUB_METRICS_PORT")
+
+PREFIX = "health_hub"
+
+_lock = threading.Lock()
+# section -> [count, total seconds, max seconds], process-wide
+_sections = {}
+# (cache name, "hit" / "miss") -> count
+_cache_requests = {}
+# counter name -> value
+_counters = {}
+# Timings of the script run currently executing on this thread (one per session)
+_current_run = threading.local()
+_server = None
+
+
+# --- Recording ---
+@contextmanager
+def section(name):
+    """Time a named section of the dashboard."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_section(name, time.perf_counter() - started)
+
+
+def record_section(name, seconds):
+    with _lock:
+        stats = _sections.setdefault(name, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = max(stats[2], seconds)
+    run = getattr(_current_run, "sections", None)
+    if run is not None:
+        run[name] = run.get(name, 0.0) + seconds
+
+
+def count(name, amount=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def cache_request(cache, hit):
+    with _lock:
+        key = (cache, "hit" if hit else "miss")
+        _cache_requests[key] = _cache_requests.get(key, 0) + 1
+
+
+@contextmanager
+def cached_call(cache):
+    """Count a call to a Streamlit-cached function as a hit unless it records a miss.
+
+    The cached function body calls :func:`cache_miss`; it only runs on a miss.
+    """
+    _current_run.miss = False
+    try:
+        yield
+    finally:
+        cache_request(cache, hit=not _current_run.miss)
+
+
+def cache_miss():
+    _current_run.miss = True
+
+
+def begin_run():
+    """Start timing a full script run; fragment reruns keep adding to the last one."""
+    _current_run.sections = {}
+    _current_run.started = time.perf_counter()
+
+
+def end_run():
+    """Record the full script run and refresh the metrics file."""
+    started = getattr(_current_run, "started", None)
+    if started is not None:
+        record_section("script_run", time.perf_counter() - started)
+        _current_run.started = None
+    write_metrics_file()
+
+
+def run_sections():
+    """Section timings of the script run on the calling thread so far."""
+    return dict(getattr(_current_run, "sections", {}) or {})
+
+
+def cache_hit_rates():
+    """cache name -> (hits, misses) since the process started."""
+    with _lock:
+        requests = dict(_cache_requests)
+    rates = {cache: (requests.get((cache, "hit"), 0), requests.get((cache, "miss"), 0))
+             for cache, _ in requests}
+    rates["chart_render"] = (charts.chart_cache.hits, charts.chart_cache.misses)
+    return rates
+
+
+# --- Prometheus Export ---
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text():
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+        lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+        for suffix, labels, value in samples:
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+            lines.append(f"{PREFIX}_{name}{suffix}{{{label_text}}} {value}" if label_text
+                         else f"{PREFIX}_{name}{suffix} {value}")
+
+    with _lock:
+        sections = {name: list(stats) for name, stats in _sections.items()}
+        cache_requests = dict(_cache_requests)
+        counters = dict(_counters)
+    cache_requests[("chart_render", "hit")] = charts.chart_cache.hits
+    cache_requests[("chart_render", "miss")] = charts.chart_cache.misses
+
+    metric("section_seconds", "summary", "Time spent in each dashboard section.",
+           [(suffix, {"section": name}, value) for name, (n, total, _) in sorted(sections.items())
+            for suffix, value in (("_count", n), ("_sum", f"{total:.6f}"))])
+    metric("section_max_seconds", "gauge", "Slowest single execution of each section.",
+           [("", {"section": name}, f"{worst:.6f}") for name, (_, _, worst) in sorted(sections.items())])
+    metric("cache_requests_total", "counter", "Cache lookups by cache and result.",
+           [("", {"cache": cache, "result": result}, n) for (cache, result), n in sorted(cache_requests.items())])
+    metric("figures_rendered_total", "counter", "Matplotlib figures drawn and encoded.",
+           [("", {"process": "script"}, charts.figures_rendered),
+            ("", {"process": "worker"}, counters.get("worker_figures_rendered", 0))])
+    pyplot = sys.modules.get("matplotlib.pyplot")
+    metric("open_figures", "gauge", "Matplotlib figures currently open in this process.",
+           [("", {}, len(pyplot.get_fignums()) if pyplot is not None else 0)])
+    metric("chart_cache_bytes", "gauge", "Bytes of encoded charts held by the chart cache.",
+           [("", {}, charts.chart_cache.size_bytes)])
+    metric("process_memory_bytes", "gauge", "Resident memory of the dashboard process.",
+           [("", {"kind": kind}, value) for kind, value in sorted(data_loader.process_memory().items())])
+    metric("import_seconds", "gauge", "Time spent importing lazily loaded modules.",
+           [("", {"module": module}, f"{seconds:.6f}") for module, seconds in sorted(startup.import_timings.items())])
+    metric("startup_seconds", "gauge", "Seconds from the first script run to each startup phase.",
+           [("", {"phase": phase}, f"{seconds:.6f}") for phase, seconds in sorted(startup.startup_timings.items())])
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_file(path=METRICS_FILE):
+    if not path:
+        return
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port=METRICS_PORT):
+    """Start the /metrics endpoint on a daemon thread (once per process)."""
+    global _server
+    if not port:
+        return
+    with _lock:
+        if _server is not None:
+            return
+        try:
+            _server = ThreadingHTTPServer(("127.0.0.1", int(port)), _MetricsHandler)
+        except OSError:
+            # Port taken, e.g. by another dashboard worker: leave the export to it
+            return
+    threading.Thread(target=_server.serve_forever, name="metrics-endpoint", daemon=True).start()
@@ -0,0 +1,216 @@
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import types
+from collections import namedtuple
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import streamlit as st
+
+import charts
+import data_loader
+import distributions
+import instrumentation
+from aggregates import WardCube
+
+# 0 disables the pool and renders every chart in the script thread. That is the
+# default on a single core, where spawning workers only delays the first load.
+_cpus = os.cpu_count() or 1
+RENDER_WORKERS = int(os.environ.get("HEALTH_HUB_RENDER_WORKERS", min(4, _cpus) if _cpus >= 2 else 0))
+# Seconds to wait for a worker before drawing the chart in-process instead
+RENDER_TIMEOUT = float(os.environ.get("HEALTH_HUB_RENDER_TIMEOUT", 30))
+
+FIGSIZES = {"heatmap": (10, 8)}
+
+# key: the ChartKey to render; labels: the translated strings the draw function takes;
+# inputs: small precomputed data the chart is drawn from (e.g. a correlation matrix)
+RenderJob = namedtuple("RenderJob", ["key", "labels", "inputs"], defaults=[None])
+
+
+# --- Drawing (shared by workers and the in-process fallback) ---
+def draw_job(job, data, cube):
+    """Return a draw callback for ``job`` over the given data and ward cube."""
+    kind, column, version = job.key.kind, job.key.column, job.key.version
+    if kind == "bar":
+        return lambda ax: charts.draw_bar(ax, cube.ward_frame("mean"), column, *job.labels)
+    if kind == "box":
+        return lambda ax: charts.draw_box(ax, distributions.column_box_stats(data, column, version), *job.labels)
+    if kind == "hist":
+        return lambda ax: charts.draw_hist(ax, distributions.column_histogram(data, column, version), *job.labels)
+    if kind == "heatmap":
+        if job.inputs is not None:
+            return lambda ax: charts.draw_heatmap(ax, job.inputs, *job.labels)
+        numeric_cols = data.select_dtypes(include=['number']).columns
+        return lambda ax: charts.draw_heatmap(ax, data[numeric_cols].corr(), *job.labels)
+    raise ValueError(f"Unknown chart kind: {kind}")
+
+
+# --- Worker Process Side ---
+_worker_data = None
+_worker_cube = None
+
+
+def _init_worker(columnar_file):
+    # Every worker maps the same Arrow file, so the OS page cache holds one shared,
+    # read-only copy of the data regardless of the number of workers.
+    global _worker_data, _worker_cube
+    _worker_data = data_loader.read_columnar(columnar_file)
+    _worker_cube = WardCube.from_frame(_worker_data)
+
+
+def _render_in_worker(job):
+    # The render time travels back with the image; the worker's own metrics are lost
+    started = time.perf_counter()
+    image = charts.render_png(draw_job(job, _worker_data, _worker_cube), FIGSIZES.get(job.key.kind, (10, 6)))
+    return image, time.perf_counter() - started
+
+
+def _render_in_process(job, draw):
+    # PanelBoard.place already counted this lookup; peek in case another session rendered it since
+    image = charts.chart_cache.peek(job.key)
+    if image is None:
+        with instrumentation.section(f"render_{job.key.kind}"):
+            image = charts.render_png(draw, FIGSIZES.get(job.key.kind, (10, 6)))
+        charts.chart_cache.put(job.key, image)
+    return image
+
+
+# --- Script Side ---
+_pool = None
+_pool_source = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(columnar_file):
+    global _pool, _pool_source
+    with _pool_lock:
+        if _pool is not None and _pool_source != columnar_file:
+            # Dataset changed: workers hold the old data, so start a fresh pool
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _pool is None:
+            _pool = make_pool(columnar_file)
+            _pool_source = columnar_file
+        return _pool
+
+
+def make_pool(columnar_file, max_workers=RENDER_WORKERS):
+    """A process pool whose workers map ``columnar_file``; submit jobs with :func:`submit_job`."""
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        # spawn avoids forking a process that is running server threads
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(columnar_file,),
+    )
+
+
+def submit_job(pool, job):
+    """Render ``job`` on ``pool``; the future resolves to ``(png bytes, seconds)``."""
+    return pool.submit(_render_in_worker, job)
+
+
+def _reset_pool(wait=False):
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=wait, cancel_futures=True)
+            _pool = None
+
+
+def shutdown():
+    """Stop the render workers and wait for them to exit."""
+    _reset_pool(wait=True)
+
+
+@contextmanager
+def _script_hidden_from_spawn():
+    # Streamlit executes app.py as the __main__ module, and spawn re-imports
+    # __main__ in every new worker - which would run the whole dashboard there.
+    # Workers are started lazily inside pool.submit, so hide the script meanwhile.
+    main_module = sys.modules.get("__main__")
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main_module
+
+
+def submit(jobs, columnar_file):
+    """Start rendering every job that is not already cached; return {key: future}.
+
+    Returns an empty dict when the pool is disabled or the columnar copy of the
+    dataset is unavailable; callers then render in-process.
+    """
+    if RENDER_WORKERS <= 0 or not columnar_file or not os.path.exists(columnar_file):
+        return {}
+    pending = {}
+    try:
+        pool = _get_pool(columnar_file)
+        with _pool_lock, _script_hidden_from_spawn():
+            for job in jobs:
+                if job.key not in pending and charts.chart_cache.peek(job.key) is None:
+                    pending[job.key] = submit_job(pool, job)
+    except (BrokenProcessPool, RuntimeError):
+        _reset_pool()
+    return pending
+
+
+class PanelBoard:
+    """Collects chart slots during a script run and fills them as renders finish.
+
+    Panels call :meth:`place`; a chart that is cached or not pending is drawn
+    immediately, otherwise an empty placeholder is reserved. :meth:`fill` then
+    fills placeholders in completion order, falling back to in-process rendering
+    for any job that failed or timed out.
+    """
+
+    def __init__(self, pending=None):
+        self.pending = pending or {}
+        self._slots = []
+
+    def place(self, job, draw):
+        # The one counted cache lookup per chart; submit() and the fallbacks only peek
+        image = charts.chart_cache.get(job.key)
+        if image is not None:
+            st.image(image)
+        elif job.key in self.pending:
+            self._slots.append((st.empty(), job, draw))
+        else:
+            st.image(_render_in_process(job, draw))
+
+    def fill(self):
+        futures = {self.pending[job.key]: (slot, job, draw) for slot, job, draw in self._slots}
+        not_done = set(futures)
+        while not_done:
+            done, not_done = wait(not_done, timeout=RENDER_TIMEOUT, return_when=FIRST_COMPLETED)
+            if not done:
+                # Nothing finished within the time-out: render the rest here
+                for future in not_done:
+                    future.cancel()
+                    self._fallback(*futures[future])
+                break
+            for future in done:
+                slot, job, draw = futures[future]
+                try:
+                    image, seconds = future.result()
+                except Exception:
+                    if isinstance(future.exception(), BrokenProcessPool):
+                        _reset_pool()
+                    self._fallback(slot, job, draw)
+                    continue
+                instrumentation.record_section(f"render_{job.key.kind}", seconds)
+                instrumentation.count("worker_figures_rendered")
+                charts.chart_cache.put(job.key, image)
+                slot.image(image)
+        # Fragment reruns after this point render in-process
+        self._slots = []
+        self.pending = {}
+
+    @staticmethod
+    def _fallback(slot, job, draw):
+        slot.image(_render_in_process(job, draw))
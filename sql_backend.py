@@ -0,0 +1,117 @@
+import os
+import queue
+import sqlite3
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+from aggregates import WardCube
+
+TABLE = "wards"
+POOL_SIZE = int(os.environ.get("HEALTH_HUB_SQL_POOL_SIZE", 8))
+# Rows handed to the panels that plot individual points (scatter, box, histogram, ...)
+SAMPLE_ROWS = 5000
+
+
+def database_path(file_path, content_hash):
+    return os.path.splitext(data_loader.columnar_path(file_path, content_hash))[0] + ".sqlite"
+
+
+def build_database(file_path, target_path):
+    """Load the CSV into an indexed SQLite table, streaming it chunk by chunk."""
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    tmp_path = f"{target_path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        for chunk in data_loader.iter_chunks(file_path):
+            chunk.to_sql(TABLE, conn, if_exists="append", index=False)
+        conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{TABLE}_ward ON {TABLE} ("Ward")')
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, target_path)
+    data_loader.remove_stale_copies(target_path)
+
+
+# --- Connection Pool ---
+class ConnectionPool:
+    """Fixed set of read-only connections shared by every dashboard session."""
+
+    def __init__(self, db_path, size=POOL_SIZE):
+        self._connections = queue.Queue()
+        for _ in range(size):
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON")
+            self._connections.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self._connections.get()
+        try:
+            yield conn
+        finally:
+            self._connections.put(conn)
+
+
+# --- Ward Store ---
+class SqlWardStore:
+    """Ward table on disk; filters and aggregates run as SQL over pooled connections."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.pool = ConnectionPool(db_path)
+        with self.pool.connection() as conn:
+            table_info = conn.execute(f"PRAGMA table_info({TABLE})").fetchall()
+        self.columns = [row[1] for row in table_info]
+        self.numeric_columns = [row[1] for row in table_info if row[2] in ("INTEGER", "REAL") and row[1] != "Ward"]
+        self._sample = None
+
+    @classmethod
+    def open(cls, file_path, content_hash):
+        db_path = database_path(file_path, content_hash)
+        if not os.path.exists(db_path):
+            build_database(file_path, db_path)
+        return cls(db_path)
+
+    def query(self, sql, params=()):
+        with self.pool.connection() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def cube(self):
+        # Per-ward counts, sums and non-NULL counts computed by SQLite, wards in
+        # first-appearance order. TOTAL() skips NULLs and is 0.0 for an all-NULL group.
+        n = len(self.numeric_columns)
+        sums = ", ".join(f'TOTAL("{c}")' for c in self.numeric_columns)
+        value_counts = ", ".join(f'COUNT("{c}")' for c in self.numeric_columns)
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f'SELECT "Ward", COUNT(*), {sums}, {value_counts} FROM {TABLE} GROUP BY "Ward" ORDER BY MIN(rowid)'
+            ).fetchall()
+        # Rows with a NULL Ward belong to no ward but still count towards the city total
+        unassigned = next(((row[1], np.array(row[2:2 + n], dtype=float), np.array(row[2 + n:], dtype=np.int64))
+                           for row in rows if row[0] is None), None)
+        rows = [row for row in rows if row[0] is not None]
+        wards = [row[0] for row in rows]
+        counts = np.array([row[1] for row in rows], dtype=np.int64)
+        totals = np.array([row[2:2 + n] for row in rows], dtype=float).reshape(len(rows), n)
+        value_counts = np.array([row[2 + n:] for row in rows], dtype=np.int64).reshape(len(rows), n)
+        return WardCube(wards, self.numeric_columns, counts, totals, row_lookup=self.ward_rows,
+                        value_counts=value_counts, unassigned=unassigned)
+
+    def ward_rows(self, ward):
+        # Served by the index on Ward
+        return self.query(f'SELECT * FROM {TABLE} WHERE "Ward" = ? ORDER BY rowid', (ward,))
+
+    @property
+    def sample(self):
+        """Evenly spaced rows (by rowid) for the panels that plot raw points."""
+        if self._sample is None:
+            with self.pool.connection() as conn:
+                row_count = conn.execute(f"SELECT MAX(rowid) FROM {TABLE}").fetchone()[0] or 0
+            step = max(row_count // SAMPLE_ROWS, 1)
+            self._sample = self.query(f"SELECT * FROM {TABLE} WHERE rowid % ? = 0 LIMIT ?", (step, SAMPLE_ROWS))
+        return self._sample
@@ -0,0 +1,91 @@
+import importlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# This module is imported on the first script run, so times are relative to that
+_first_run_start = time.perf_counter()
+
+# module name -> seconds spent importing it (first import only)
+import_timings = {}
+# phase name -> seconds since the first script run started (first occurrence only)
+startup_timings = {}
+
+_lazy_modules = {}
+_warm_up_thread = None
+_lock = threading.Lock()
+
+
+# --- Lazy Imports ---
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access.
+
+    ``before_import`` runs once just before the real import (e.g. to select a
+    matplotlib backend).
+    """
+
+    def __init__(self, name, before_import=None):
+        self._name = name
+        self._before_import = before_import
+        self._module = None
+        self._load_lock = threading.Lock()
+
+    def load(self):
+        if self._module is None:
+            with self._load_lock:
+                if self._module is None:
+                    started = time.perf_counter()
+                    if self._before_import is not None:
+                        self._before_import()
+                    module = importlib.import_module(self._name)
+                    import_timings.setdefault(self._name, time.perf_counter() - started)
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_module(name, before_import=None):
+    """Return the process-wide lazy proxy for ``name``."""
+    with _lock:
+        proxy = _lazy_modules.get(name)
+        if proxy is None:
+            proxy = _lazy_modules[name] = LazyModule(name, before_import)
+        return proxy
+
+
+def warm_up():
+    """Import every registered lazy module on a background thread (once per process)."""
+    global _warm_up_thread
+    with _lock:
+        if _warm_up_thread is not None:
+            return
+        proxies = list(_lazy_modules.values())
+        _warm_up_thread = threading.Thread(target=_warm, args=(proxies,), name="lazy-import-warm-up", daemon=True)
+    _warm_up_thread.start()
+
+
+def _warm(proxies):
+    for proxy in proxies:
+        try:
+            proxy.load()
+        except Exception:
+            # The panel that needs it will raise the error in the foreground instead
+            logger.exception("Background import of %s failed", proxy._name)
+    mark("warm_up_complete")
+    logger.info("Lazy import timings (s): %s", {k: round(v, 3) for k, v in import_timings.items()})
+
+
+# --- Startup Timings ---
+def mark(phase):
+    """Record the first time ``phase`` is reached in this process."""
+    if phase not in startup_timings:
+        startup_timings[phase] = time.perf_counter() - _first_run_start
+        logger.info("Startup: %s after %.3fs", phase, startup_timings[phase])
@@ -0,0 +1,130 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_loader
+from aggregates import TOTAL_KEY, WardAggregates, WardCube
+
+CSV = """Ward,Population,Avg_Age,Diabetes_Cases,Hypertension_Cases,Flu_Cases,Access_to_Sanitation_Pct,Avg_Income_USD,Num_Clinics
+Ward A,5000,35,250,400,150,60,1200,2
+Ward B,,32,300,500,200,75,1500,3
+Ward A,6000,,280,420,160,62,1250,1
+,4000,40,100,200,80,50,1000,1
+Ward C,7000,45,,600,250,80,1800,2
+Ward B,6500,38,310,520,210,,1550,
+"""
+
+
+@pytest.fixture
+def frame():
+    return pd.read_csv(io.StringIO(CSV))
+
+
+def test_cube_matches_pandas_with_missing_values(frame):
+    cube = WardCube.from_frame(frame)
+    columns = frame.select_dtypes(include=['number']).columns
+    # Rows with a blank Ward belong to no ward but count towards the city total
+    assert cube.wards == ['Ward A', 'Ward B', 'Ward C']
+    for column in columns:
+        assert cube.total(column) == pytest.approx(frame[column].sum())
+        assert cube.mean(column) == pytest.approx(frame[column].mean())
+    grouped = frame.groupby('Ward', sort=False)
+    for ward in cube.wards:
+        for column in columns:
+            assert cube.sums.at[ward, column] == pytest.approx(grouped[column].sum()[ward])
+            expected = grouped[column].mean()[ward]
+            if np.isnan(expected):
+                assert np.isnan(cube.mean(column, ward))
+            else:
+                assert cube.mean(column, ward) == pytest.approx(expected)
+    assert int(cube.total('Population')) == 28_500
+
+
+def test_ward_rows_skip_rows_without_a_ward(frame):
+    cube = WardCube.from_frame(frame)
+    for ward in cube.wards:
+        pd.testing.assert_frame_equal(cube.ward_rows(frame, ward), frame[frame['Ward'] == ward])
+    assert len(cube.ward_rows(frame, TOTAL_KEY)) == len(frame)
+
+
+def test_clustered_frame_with_blank_wards(frame):
+    clustered = data_loader._cluster_by_ward(frame)
+    assert clustered['Ward'].isna().iloc[0]
+    cube = WardCube.from_frame(clustered)
+    for ward in cube.wards:
+        rows = cube.ward_rows(clustered, ward)
+        pd.testing.assert_frame_equal(rows, clustered[clustered['Ward'] == ward])
+        # Clustered: a ward's rows are a plain slice
+        assert rows.index.is_monotonic_increasing and rows.index[-1] - rows.index[0] == len(rows) - 1
+
+
+def test_load_dataset_with_blank_ward(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text(CSV)
+    data = data_loader.load_dataset(str(path)).frame
+    cube = WardCube.from_frame(data)
+    assert cube.wards == ['Ward A', 'Ward B', 'Ward C']
+    assert len(data) == 6
+
+
+def test_ward_detail_with_missing_population(frame):
+    detail = WardCube.from_frame(data_loader.add_prevalence_columns(frame)).ward_detail(
+        'Ward B', data_loader.PREVALENCE_COLUMNS)
+    assert detail['Population'] == 6_500
+    assert detail['Diabetes_Cases'] == 610
+
+
+def test_streamed_aggregates_match_the_full_frame(tmp_path, frame):
+    path = tmp_path / "data.csv"
+    path.write_text(CSV)
+    aggregates = data_loader.stream_aggregates(str(path), chunk_rows=2)
+    streamed = WardCube.from_aggregates(aggregates)
+    full = WardCube.from_frame(data_loader.add_prevalence_columns(frame))
+    assert aggregates.total_rows == len(frame)
+    assert streamed.wards == full.wards
+    pd.testing.assert_frame_equal(streamed.sums, full.sums[streamed.columns])
+    pd.testing.assert_frame_equal(streamed.means, full.means[streamed.columns])
+
+
+def test_sql_cube_matches_the_full_frame(tmp_path, frame):
+    import sql_backend
+
+    path = tmp_path / "data.csv"
+    path.write_text(CSV)
+    store = sql_backend.SqlWardStore.open(str(path), data_loader.source_fingerprint(str(path))[2])
+    cube = store.cube()
+    full = WardCube.from_frame(data_loader.add_prevalence_columns(frame))
+    assert cube.wards == full.wards
+    pd.testing.assert_frame_equal(cube.sums, full.sums[cube.columns])
+    pd.testing.assert_frame_equal(cube.means, full.means[cube.columns])
+
+
+def test_numbered_wards_are_not_a_value_column(tmp_path, frame):
+    import sql_backend
+
+    numbered = frame.dropna(subset=['Ward']).assign(Ward=lambda df: df['Ward'].str[-1].map({'A': 1, 'B': 2, 'C': 3}))
+    path = tmp_path / "data.csv"
+    numbered.to_csv(path, index=False)
+    cubes = [
+        WardCube.from_frame(data_loader.load_dataset(str(path)).frame),
+        WardCube.from_aggregates(data_loader.stream_aggregates(str(path), chunk_rows=2)),
+        sql_backend.SqlWardStore.open(str(path), data_loader.source_fingerprint(str(path))[2]).cube(),
+    ]
+    for cube in cubes:
+        assert 'Ward' not in cube.columns
+        assert cube.wards == [1, 2, 3]
+        assert cube.ward_frame("sum")['Ward'].tolist() == ['1', '2', '3']
+        assert cube.ward_detail(2, data_loader.PREVALENCE_COLUMNS)['Population'] == 6_500
+
+
+def test_streaming_a_header_only_csv(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text(CSV.splitlines()[0] + "\n")
+    aggregates = data_loader.stream_aggregates(str(path))
+    assert aggregates.total_rows == 0
+    assert aggregates.sample.empty
+    assert list(aggregates.sample.columns)[:2] == ['Ward', 'Population']
+    # Chunks that come back empty still leave an empty sample behind
+    assert WardAggregates(['Population']).update(pd.read_csv(path)).sample.empty
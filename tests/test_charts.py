@@ -0,0 +1,38 @@
+from charts import ChartCache, ChartKey
+
+
+def _key(column):
+    return ChartKey("bar", column, None, "English", 0)
+
+
+def test_byte_cap_evicts_least_recently_used():
+    cache = ChartCache(max_bytes=100)
+    cache.put(_key("a"), b"x" * 40)
+    cache.put(_key("b"), b"x" * 40)
+    assert cache.get(_key("a")) is not None  # "b" is now the oldest
+    cache.put(_key("c"), b"x" * 40)
+    assert cache.peek(_key("b")) is None
+    assert cache.peek(_key("a")) is not None and cache.peek(_key("c")) is not None
+    assert cache.size_bytes == 80 and len(cache) == 2
+
+
+def test_replacing_an_entry_keeps_the_byte_count():
+    cache = ChartCache(max_bytes=100)
+    cache.put(_key("a"), b"x" * 60)
+    cache.put(_key("a"), b"x" * 30)
+    assert cache.size_bytes == 30 and len(cache) == 1
+
+
+def test_image_larger_than_the_cap_is_not_cached():
+    cache = ChartCache(max_bytes=100)
+    cache.put(_key("a"), b"x" * 50)
+    cache.put(_key("b"), b"x" * 101)
+    assert cache.peek(_key("b")) is None
+    assert cache.peek(_key("a")) is not None and cache.size_bytes == 50
+
+
+def test_entry_cap():
+    cache = ChartCache(max_bytes=1_000, max_entries=2)
+    for column in "abc":
+        cache.put(_key(column), b"x")
+    assert [cache.peek(_key(c)) is not None for c in "abc"] == [False, True, True]
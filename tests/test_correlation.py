@@ -0,0 +1,164 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import correlation
+import data_loader
+from correlation import CorrelationTracker, StreamingCorrelation
+
+
+def _frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    population = rng.integers(1_000, 10_000, rows)
+    return pd.DataFrame({
+        'Ward': [f"Ward {i % 7}" for i in range(rows)],
+        'Population': population,
+        'Avg_Age': rng.integers(20, 60, rows),
+        'Diabetes_Cases': (population * rng.uniform(0.02, 0.08, rows)).astype(int),
+        'Hypertension_Cases': (population * rng.uniform(0.04, 0.10, rows)).astype(int),
+        'Flu_Cases': (population * rng.uniform(0.01, 0.05, rows)).astype(int),
+        'Access_to_Sanitation_Pct': rng.integers(30, 100, rows),
+        'Avg_Income_USD': rng.integers(500, 3_000, rows),
+        'Num_Clinics': rng.integers(0, 6, rows),
+    })
+
+
+def _expected(path):
+    df = data_loader.add_prevalence_columns(pd.read_csv(path))
+    return df.select_dtypes(include=['number']).corr()
+
+
+def test_merge_matches_single_pass():
+    df = data_loader.add_prevalence_columns(_frame(1_000))
+    columns = df.select_dtypes(include=['number']).columns
+    whole = StreamingCorrelation(columns).update(df)
+    merged = StreamingCorrelation(columns).update(df.iloc[:300]).merge(
+        StreamingCorrelation(columns).update(df.iloc[300:]))
+    assert merged.count == whole.count == 1_000
+    np.testing.assert_allclose(merged.comoment, whole.comoment, rtol=1e-9)
+    np.testing.assert_allclose(merged.corr().to_numpy(), df[columns].corr().to_numpy(), atol=1e-12)
+
+
+def _with_gaps(df, seed=0):
+    # Blank out ~10% of the numeric cells, independently per column
+    rng = np.random.default_rng(seed)
+    numeric = df.columns.drop('Ward')
+    df[numeric] = df[numeric].astype(float).mask(rng.random((len(df), len(numeric))) < 0.1)
+    return df
+
+
+def test_missing_values_use_pairwise_deletion():
+    df = data_loader.add_prevalence_columns(_with_gaps(_frame(1_000)))
+    columns = df.select_dtypes(include=['number']).columns
+    # Listwise deletion would drop most of these rows
+    assert df[columns].isna().any(axis=1).mean() > 0.5
+    expected = df[columns].corr()
+    whole = StreamingCorrelation(columns).update(df)
+    merged = StreamingCorrelation(columns)
+    for start in range(0, len(df), 137):
+        merged.merge(StreamingCorrelation(columns).update(df.iloc[start:start + 137]))
+    pd.testing.assert_frame_equal(whole.corr(), expected, atol=1e-10)
+    pd.testing.assert_frame_equal(merged.corr(), expected, atol=1e-10)
+
+
+def test_tracker_with_missing_values(tmp_path):
+    path = tmp_path / "data.csv"
+    _with_gaps(_frame(2_000)).to_csv(path, index=False)
+    tracker = CorrelationTracker(str(path))
+    tracker.refresh()
+    _with_gaps(_frame(300, seed=1), seed=1).to_csv(path, mode="a", header=False, index=False)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1))
+    pd.testing.assert_frame_equal(tracker.refresh(), _expected(path), atol=1e-10)
+
+
+def test_append_only_parses_new_rows(tmp_path):
+    path = tmp_path / "data.csv"
+    _frame(2_000).to_csv(path, index=False)
+    tracker = CorrelationTracker(str(path))
+    tracker.refresh()
+    consumed = tracker.offset
+
+    _frame(500, seed=1).to_csv(path, mode="a", header=False, index=False)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1))
+    matrix = tracker.refresh()
+    assert tracker.state.count == 2_500
+    assert tracker.offset > consumed
+    pd.testing.assert_frame_equal(matrix, _expected(path), atol=1e-10)
+
+
+def test_partial_last_line_waits_for_completion(tmp_path):
+    path = tmp_path / "data.csv"
+    _frame(100).to_csv(path, index=False)
+    tracker = CorrelationTracker(str(path))
+    tracker.refresh()
+    with open(path, "a") as f:
+        f.write("Ward 9,5000,40")
+    tracker.refresh()
+    assert tracker.state.count == 100
+
+
+def test_same_size_edit_before_tail_rebuilds(tmp_path):
+    # Regression: an edit far before the consumed offset that keeps the file size
+    # must not be mistaken for "nothing appended".
+    path = tmp_path / "data.csv"
+    df = _frame(3_000)
+    df.to_csv(path, index=False)
+    tracker = CorrelationTracker(str(path))
+    tracker.refresh()
+    assert os.path.getsize(path) > 100 * 1024
+
+    first_population = str(df.loc[0, 'Population'])
+    edited = str(int(first_population[0]) % 9 + 1) + first_population[1:]
+    df.loc[0, 'Population'] = int(edited)
+    before = os.path.getsize(path)
+    df.to_csv(path, index=False)
+    assert os.path.getsize(path) == before
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1))
+
+    matrix = tracker.refresh()
+    assert tracker.state.count == 3_000
+    pd.testing.assert_frame_equal(matrix, _expected(path), atol=1e-10)
+
+
+def test_truncated_file_rebuilds(tmp_path):
+    path = tmp_path / "data.csv"
+    _frame(1_000).to_csv(path, index=False)
+    tracker = CorrelationTracker(str(path))
+    tracker.refresh()
+    _frame(400, seed=2).to_csv(path, index=False)
+    matrix = tracker.refresh()
+    assert tracker.state.count == 400
+    pd.testing.assert_frame_equal(matrix, _expected(path), atol=1e-10)
+
+
+def test_restart_loads_the_saved_state(tmp_path, monkeypatch):
+    path = tmp_path / "data.csv"
+    _with_gaps(_frame(1_000)).to_csv(path, index=False)
+    expected = CorrelationTracker(str(path)).refresh()
+
+    # A new process: the state comes from .cache, without parsing the CSV
+    def no_parsing(*args, **kwargs):
+        raise AssertionError("parsed the CSV")
+    with monkeypatch.context() as patch:
+        patch.setattr(correlation.pd, "read_csv", no_parsing)
+        restored = CorrelationTracker(str(path))
+        pd.testing.assert_frame_equal(restored.refresh(), expected)
+    assert restored.state.count == 1_000
+
+    # ... and appends still only parse the new rows
+    _frame(200, seed=1).to_csv(path, mode="a", header=False, index=False)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1))
+    pd.testing.assert_frame_equal(restored.refresh(), _expected(path), atol=1e-10)
+    assert restored.state.count == 1_200
+    # The state for the old contents was replaced by the one for the new contents
+    assert len([p for p in (tmp_path / data_loader.CACHE_DIR_NAME).iterdir() if p.name.endswith(".corr.npz")]) == 1
+
+
+@pytest.mark.parametrize("rows", [0, 1])
+def test_degenerate_files(tmp_path, rows):
+    path = tmp_path / "data.csv"
+    _frame(rows).to_csv(path, index=False)
+    matrix = CorrelationTracker(str(path)).refresh()
+    assert matrix.shape[0] == matrix.shape[1]
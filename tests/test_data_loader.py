@@ -0,0 +1,24 @@
+import os
+
+import pandas as pd
+
+import data_loader
+
+
+def _write(path, rows):
+    pd.DataFrame({'Ward': ['Ward A'] * rows, 'Population': range(1_000, 1_000 + rows),
+                  'Diabetes_Cases': 10, 'Hypertension_Cases': 20, 'Flu_Cases': 5}).to_csv(path, index=False)
+
+
+def test_reload_replaces_only_its_own_stale_copy(tmp_path):
+    health, health_2024 = tmp_path / "health.csv", tmp_path / "health-2024.csv"
+    _write(health, 3)
+    _write(health_2024, 4)
+    other = data_loader.load_dataset(str(health_2024)).source_path
+    first = data_loader.load_dataset(str(health)).source_path
+
+    _write(health, 5)
+    second = data_loader.load_dataset(str(health)).source_path
+    assert second != first
+    cached = sorted(p.name for p in (tmp_path / data_loader.CACHE_DIR_NAME).iterdir())
+    assert cached == sorted([os.path.basename(second), os.path.basename(other)])
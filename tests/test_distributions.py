@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from matplotlib import cbook
+
+import distributions
+
+
+def _exact_kde(values, support):
+    # Gaussian KDE with Scott's bandwidth, summed point by point (as scipy / seaborn)
+    bw = values.std(ddof=1) * values.size ** (-1 / 5)
+    kernel = np.exp(-0.5 * ((support[:, None] - values) / bw) ** 2)
+    return kernel.sum(axis=1) / (values.size * bw * np.sqrt(2 * np.pi))
+
+
+@pytest.mark.parametrize("values", [
+    np.random.default_rng(0).normal(50, 10, 5_000),
+    np.random.default_rng(1).lognormal(0, 1, 2_000),
+    np.random.default_rng(2).integers(0, 6, 300).astype(float),
+])
+def test_binned_kde_matches_the_exact_kde(values):
+    support, density = distributions.binned_kde(values, values.min(), values.max())
+    exact = _exact_kde(values, support)
+    assert np.abs(density - exact).max() <= 1e-3 * exact.max()
+
+
+def test_histogram_kde_encloses_the_bars_area():
+    values = np.random.default_rng(0).normal(size=1_000)
+    hist = distributions.histogram(values)
+    area = (hist.counts * np.diff(hist.edges)).sum()
+    np.testing.assert_allclose(hist.kde_y, _exact_kde(values, hist.kde_x) * area, atol=1e-3 * hist.kde_y.max())
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 50, 1_000])
+def test_box_stats_match_matplotlib(size):
+    rng = np.random.default_rng(size)
+    wards = rng.choice(["Ward B", "Ward A", "Ward C"], size)
+    values = rng.lognormal(0, 1, size)
+    stats = distributions.ward_box_stats(wards, values)
+    # First-appearance order, as sns.boxplot
+    assert [s["label"] for s in stats] == list(dict.fromkeys(wards))
+    for s in stats:
+        expected = cbook.boxplot_stats(values[wards == s["label"]], whis=distributions.WHIS)[0]
+        for key in ("q1", "med", "q3", "whislo", "whishi"):
+            assert s[key] == pytest.approx(expected[key], abs=1e-12)
+        np.testing.assert_array_equal(s["fliers"], np.sort(expected["fliers"]))
+
+
+def test_box_stats_skip_missing_values_and_wards():
+    wards = np.array(["Ward A", "Ward A", None, "Ward B", "Ward A"], dtype=object)
+    values = np.array([1.0, np.nan, 5.0, np.nan, 3.0])
+    stats = distributions.ward_box_stats(wards, values)
+    # Ward B has no values left, the blank ward is no ward at all
+    assert [s["label"] for s in stats] == ["Ward A"]
+    assert (stats[0]["q1"], stats[0]["med"], stats[0]["q3"]) == (1.5, 2.0, 2.5)
+
+
+def test_no_spread():
+    hist = distributions.histogram([3.0, 3.0, 3.0])
+    assert hist.counts.sum() == 3
+    assert hist.kde_x is None and hist.kde_y is None
+    [stats] = distributions.ward_box_stats(["Ward A"] * 3, [2.0, 2.0, 2.0])
+    assert stats["q1"] == stats["med"] == stats["q3"] == stats["whislo"] == stats["whishi"] == 2.0
+    assert stats["fliers"].size == 0
+
+
+def test_all_missing():
+    hist = distributions.histogram([np.nan, np.nan])
+    assert hist.counts.size == 0
+    assert hist.kde_x is None and hist.kde_y is None
+    assert distributions.ward_box_stats(["Ward A", "Ward B"], [np.nan, np.nan]) == []
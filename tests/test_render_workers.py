@@ -0,0 +1,47 @@
+import pytest
+
+import charts
+import render_workers
+from charts import ChartCache, ChartKey
+from render_workers import PanelBoard, RenderJob
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ChartCache(max_bytes=1024 * 1024)
+    monkeypatch.setattr(charts, "chart_cache", cache)
+    monkeypatch.setattr(render_workers.st, "image", lambda image: None)
+    return cache
+
+
+def _draw(ax):
+    ax.plot([0, 1], [0, 1])
+
+
+def test_peek_does_not_count(cache):
+    key = ChartKey("bar", "Population", None, "English", 0)
+    assert cache.peek(key) is None
+    cache.put(key, b"png")
+    assert cache.peek(key) == b"png"
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_one_counted_lookup_per_placement(cache):
+    job = RenderJob(ChartKey("bar", "Population", None, "English", 0), ())
+    # Nothing pending: the first placement renders in-process, the second is a hit
+    PanelBoard().place(job, _draw)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert cache.peek(job.key) is not None
+    PanelBoard().place(job, _draw)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_submit_only_peeks(cache, monkeypatch, tmp_path):
+    columnar = tmp_path / "data.arrow"
+    columnar.write_bytes(b"")
+    monkeypatch.setattr(render_workers, "RENDER_WORKERS", 1)
+    monkeypatch.setattr(render_workers, "_get_pool", lambda columnar_file: None)
+    monkeypatch.setattr(render_workers, "submit_job", lambda pool, job: object())
+    jobs = [RenderJob(ChartKey("hist", "Avg_Age", None, "English", 0), ())]
+    assert set(render_workers.submit(jobs, str(columnar))) == {jobs[0].key}
+    assert (cache.hits, cache.misses) == (0, 0)
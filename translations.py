@@ -0,0 +1,132 @@
+# --- Translations Dictionary ---
+# UI strings per language; keys are looked up through the `_` helper in app.py.
+translations = {
+    "English": {
+        "hub_title": "Urban Health Data Hub",
+        "filters_options": "Filters & Options",
+        "select_ward": "Select Ward:",
+        "all_wards": "All Wards",
+        "select_indicator_bar_box": "Select Indicator for Bar/Box Plot:",
+        "dashboard_title": "🏙️ Budhanilkantha Health Dashboard (Demo)",
+        "dashboard_subtitle": "A prototype dashboard to visualize urban health data.",
+        "key_metrics_header": "Key Metrics (Overall City)",
+        "total_population": "Total Population",
+        "avg_diabetes_prev": "Avg. Diabetes Prevalence",
+        "avg_hypertension_prev": "Avg. Hypertension Prevalence",
+        "total_clinics": "Total Clinics",
+        "view_raw_data": "View Raw Data",
+        "ward_comparisons": "Ward Comparisons",
+        "bar_chart_title": "{indicator} by Ward (Bar Chart)", # Placeholder for indicator
+        "population_distribution_pie": "Population Distribution by Ward (Pie Chart)",
+        "relationships_trends": "Relationships and Trends",
+        "explore_relationships_scatter": "Explore Relationships (Scatter Plot)",
+        "select_x_scatter": "Select X-axis for Scatter Plot:",
+        "select_y_scatter": "Select Y-axis for Scatter Plot:",
+        "scatter_plot_title": "{y_axis} vs. {x_axis}", # Placeholders
+        "indicator_comparison_line": "Indicator Comparison Across Wards (Line Chart)",
+        "select_indicators_line": "Select indicators for Line Chart:",
+        "info_select_indicator_line": "Select at least one indicator for the line chart.",
+        "show_exact_points": "Show every point (exact view)",
+        "aggregated_view_caption": "Showing an aggregated view of {rows:,} rows.",
+        "sampled_view_caption": "Drawn from a sample of {rows:,} of {total:,} rows.",
+        "distribution_analysis": "Distribution Analysis",
+        "distribution_by_ward_box": "Distribution of {indicator} by Ward (Box Plot)",
+        "info_select_indicator_box": "Select an indicator for the box plot.",
+        "frequency_distribution_hist": "Frequency Distribution (Histogram)",
+        "select_indicator_hist": "Select Indicator for Histogram:",
+        "hist_plot_title": "Distribution of {indicator}",
+        "info_select_indicator_hist": "Select an indicator for the histogram.",
+        "correlation_analysis": "Correlation Analysis",
+        "correlation_matrix_title": "Correlation Matrix of Numeric Features",
+        "no_numeric_cols_corr": "Not enough numeric columns for a correlation matrix.",
+        "detailed_metrics_for_ward": "Detailed Metrics for {ward}",
+        "diabetes_cases_metric": "Diabetes Cases",
+        "hypertension_cases_metric": "Hypertension Cases",
+        "flu_cases_metric": "Flu Cases",
+        "access_to_sanitation_metric": "Access to Sanitation",
+        "average_income_metric": "Average Income",
+        "num_clinics_metric": "Number of Clinics",
+        "dataset_memory": "Dataset Memory (this process)",
+        "show_performance_overlay": "Show performance overlay",
+        "section_timings": "Section timings (this run, ms)",
+        "cache_hit_rates": "Cache hit rates",
+        "prometheus_metrics": "Prometheus metrics",
+        "sidebar_info": "This is a simplified demo of an Urban Health Data Hub. Real-world hubs involve complex data integration, privacy considerations, and more advanced analytics.",
+        "data_load_error": "Error: The file {file_path} was not found. Make sure it's in the same directory as app.py.",
+        "data_not_loaded_warning": "Data could not be loaded. Please check the CSV file.",
+        "select_indicator_warning": "Please select an indicator from the sidebar to view charts.",
+        # --- Keys for indicator_options (for display in selectbox) ---
+        "Diabetes Prevalence": "Diabetes Prevalence",
+        "Hypertension Prevalence": "Hypertension Prevalence",
+        "Flu Prevalence": "Flu Prevalence",
+        "Access to Sanitation (%)": "Access to Sanitation (%)",
+        "Average Income (USD)": "Average Income (USD)",
+        "Number of Clinics": "Number of Clinics",
+        "Average Age": "Average Age",
+        "Population": "Population"
+    },
+    "नेपाली": {
+        "hub_title": "शहरी स्वास्थ्य डेटा हब",
+        "filters_options": "फिल्टर र विकल्पहरू",
+        "select_ward": "वार्ड छान्नुहोस्:",
+        "all_wards": "सबै वार्डहरू",
+        "select_indicator_bar_box": "बार/बक्स प्लटका लागि सूचक छान्नुहोस्:",
+        "dashboard_title": "🏙️ बुढानिलकण्ठ स्वास्थ्य ड्यासबोर्ड (डेमो)",
+        "dashboard_subtitle": "शहरी स्वास्थ्य डेटा कल्पना गर्न एक प्रोटोटाइप ड्यासबोर्ड।",
+        "key_metrics_header": "मुख्य मेट्रिक्स (समग्र शहर)",
+        "total_population": "कुल जनसंख्या",
+        "avg_diabetes_prev": "औसत मधुमेह व्यापकता",
+        "avg_hypertension_prev": "औसत उच्च रक्तचाप व्यापकता",
+        "total_clinics": "कुल क्लिनिकहरू",
+        "view_raw_data": "कच्चा डाटा हेर्नुहोस्",
+        "ward_comparisons": "वार्ड तुलना",
+        "bar_chart_title": "{indicator} वार्ड अनुसार (बार चार्ट)",
+        "population_distribution_pie": "वार्ड अनुसार जनसंख्या वितरण (पाई चार्ट)",
+        "relationships_trends": "सम्बन्ध र प्रवृत्तिहरू",
+        "explore_relationships_scatter": "सम्बन्धहरू अन्वेषण गर्नुहोस् (स्क्याटर प्लट)",
+        "select_x_scatter": "स्क्याटर प्लटका लागि X-अक्ष छान्नुहोस्:",
+        "select_y_scatter": "स्क्याटर प्लटका लागि Y-अक्ष छान्नुहोस्:",
+        "scatter_plot_title": "{y_axis} विरुद्ध {x_axis}",
+        "indicator_comparison_line": "वार्डहरूमा सूचक तुलना (लाइन चार्ट)",
+        "select_indicators_line": "लाइन चार्टका लागि सूचकहरू छान्नुहोस्:",
+        "info_select_indicator_line": "लाइन चार्टका लागि कम्तिमा एक सूचक छान्नुहोस्।",
+        "show_exact_points": "हरेक बिन्दु देखाउनुहोस् (सटीक दृश्य)",
+        "aggregated_view_caption": "{rows:,} पङ्क्तिहरूको समग्र दृश्य देखाइँदै।",
+        "sampled_view_caption": "{total:,} पङ्क्तिहरूमध्ये {rows:,} पङ्क्तिहरूको नमूनाबाट देखाइँदै।",
+        "distribution_analysis": "वितरण विश्लेषण",
+        "distribution_by_ward_box": "{indicator} को वार्ड अनुसार वितरण (बक्स प्लट)",
+        "info_select_indicator_box": "बक्स प्लटका लागि एक सूचक छान्नुहोस्।",
+        "frequency_distribution_hist": "आवृत्ति वितरण (हिस्टोग्राम)",
+        "select_indicator_hist": "हिस्टोग्रामका लागि सूचक छान्नुहोस्:",
+        "hist_plot_title": "{indicator} को वितरण",
+        "info_select_indicator_hist": "हिस्टोग्रामका लागि एक सूचक छान्नुहोस्।",
+        "correlation_analysis": "सहसम्बन्ध विश्लेषण",
+        "correlation_matrix_title": "संख्यात्मक विशेषताहरूको सहसम्बन्ध म्याट्रिक्स",
+        "no_numeric_cols_corr": "सहसम्बन्ध म्याट्रिक्सका लागि पर्याप्त संख्यात्मक स्तम्भहरू छैनन्।",
+        "detailed_metrics_for_ward": "{ward} का लागि विस्तृत मेट्रिक्स",
+        "diabetes_cases_metric": "मधुमेहका केसहरू",
+        "hypertension_cases_metric": "उच्च रक्तचापका केसहरू",
+        "flu_cases_metric": "फ्लूका केसहरू",
+        "access_to_sanitation_metric": "सरसफाइमा पहुँच",
+        "average_income_metric": "औसत आय",
+        "num_clinics_metric": "क्लिनिक संख्या",
+        "dataset_memory": "डेटासेट मेमोरी (यो प्रक्रिया)",
+        "show_performance_overlay": "कार्यसम्पादन विवरण देखाउनुहोस्",
+        "section_timings": "खण्डगत समय (यो रन, मि.से.)",
+        "cache_hit_rates": "क्यास हिट दर",
+        "prometheus_metrics": "Prometheus मेट्रिक्स",
+        "sidebar_info": "यो शहरी स्वास्थ्य डेटा हबको एक सरलीकृत डेमो हो। वास्तविक संसारका हबहरूमा जटिल डेटा एकीकरण, गोपनीयता विचारहरू, र थप उन्नत विश्लेषणहरू समावेश हुन्छन्।",
+        "data_load_error": "त्रुटि: फाइल {file_path} फेला परेन। यो app.py सँगैको डाइरेक्टरीमा छ भनी सुनिश्चित गर्नुहोस्।",
+        "data_not_loaded_warning": "डाटा लोड हुन सकेन। कृपया CSV फाइल जाँच गर्नुहोस्।",
+        "select_indicator_warning": "चार्टहरू हेर्न कृपया साइडबारबाट सूचक चयन गर्नुहोस्।",
+        # --- Keys for indicator_options (for display in selectbox) ---
+        "Diabetes Prevalence": "मधुमेहको व्यापकता",
+        "Hypertension Prevalence": "उच्च रक्तचापको व्यापकता",
+        "Flu Prevalence": "फ्लूको व्यापकता",
+        "Access to Sanitation (%)": "सरसफाइमा पहुँच (%)",
+        "Average Income (USD)": "औसत आय (USD)",
+        "Number of Clinics": "क्लिनिक संख्या",
+        "Average Age": "औसत उमेर",
+        "Population": "जनसंख्या"
+    }
+}